@@ -0,0 +1,50 @@
+"""
+Blocking Work
+Runs filesystem- and CPU-heavy calls on eventlet's bounded pool of OS
+threads when the app is served by serve.py, so they do not stall the event
+loop that answers HTTP and Socket.IO traffic. In the development server
+the call simply runs in the caller's thread.
+
+The pool size is eventlet's EVENTLET_THREADPOOL_SIZE (default 20). Calls
+passed here must not wait on locks shared with green threads, which
+includes logging: return results and log them in the caller. Libraries
+they use must be imported before monkey-patching (see preimport), or
+their module-level locks become green and crash when two pool threads
+contend for them.
+"""
+
+import sys
+import importlib
+
+# Libraries used on the thread pool; soundfile, for one, holds a class-level
+# lock around every file open
+POOL_LIBRARIES = (
+    "numpy",
+    "soundfile",
+    "mmap_ninja.ragged",
+    "pymicro_features",
+    "tflite_runtime.interpreter",
+)
+
+
+def preimport():
+    """Import POOL_LIBRARIES so their locks are real OS locks; call before monkey_patch()"""
+    for name in POOL_LIBRARIES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+
+
+def green():
+    """True when the process has been monkey-patched by eventlet"""
+    eventlet = sys.modules.get('eventlet')
+    return eventlet is not None and eventlet.patcher.is_monkey_patched('thread')
+
+
+def run_blocking(fn, *args, **kwargs):
+    """Call fn(*args, **kwargs) without blocking the event loop; returns its result"""
+    if green():
+        from eventlet import tpool
+        return tpool.execute(fn, *args, **kwargs)
+    return fn(*args, **kwargs)
@@ -0,0 +1,133 @@
+"""
+Compact Feature Storage
+Optional narrow on-disk formats for spectrogram feature mmaps, and a
+reader that dequantizes them on the fly for microWakeWord training
+
+Formats:
+    float32  - RaggedMmap as written by microWakeWord (default)
+    float16  - RaggedMmap of float16 values, cast back to float32 on read
+    uint8    - RaggedMmap of uint8 codes plus a per-feature (offset, scale)
+               pair in scales.npy; value = offset + code * scale
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+FORMATS = ("float32", "float16", "uint8")
+METADATA_FILE = "quantization.json"
+SCALES_FILE = "scales.npy"
+
+
+def quantize(features, fmt):
+    """Encode one spectrogram; returns (stored array, (offset, scale) or None)"""
+    features = np.asarray(features, dtype=np.float32)
+    if fmt == "float16":
+        return features.astype(np.float16), None
+    if fmt == "uint8":
+        low = float(features.min()) if features.size else 0.0
+        high = float(features.max()) if features.size else 0.0
+        scale = (high - low) / 255.0 or 1.0
+        codes = np.rint((features - low) / scale).clip(0, 255).astype(np.uint8)
+        return codes, (low, scale)
+    return features, None
+
+
+def dequantize(stored, params=None):
+    """Decode one stored spectrogram back to float32"""
+    if params is None:
+        return np.asarray(stored, dtype=np.float32)
+    offset, scale = params
+    decoded = stored.astype(np.float32)
+    decoded *= scale
+    decoded += offset
+    return decoded
+
+
+def write_features(out_dir, sample_generator, fmt="float32", batch_size=50, verbose=False):
+    """Write spectrograms from sample_generator as a RaggedMmap in the given format"""
+    from mmap_ninja.ragged import RaggedMmap
+
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown feature format '{fmt}', expected one of {FORMATS}")
+
+    out_dir = Path(out_dir)
+    scales = []
+
+    def encoded():
+        for features in sample_generator:
+            stored, params = quantize(features, fmt)
+            if params is not None:
+                scales.append(params)
+            yield stored
+
+    RaggedMmap.from_generator(
+        out_dir=str(out_dir),
+        sample_generator=encoded() if fmt != "float32" else sample_generator,
+        batch_size=batch_size,
+        verbose=verbose,
+    )
+
+    if fmt != "float32":
+        if fmt == "uint8":
+            np.save(out_dir / SCALES_FILE, np.asarray(scales, dtype=np.float32).reshape(-1, 2))
+        (out_dir / METADATA_FILE).write_text(json.dumps({"format": fmt, "version": 1}))
+
+
+def feature_format(path):
+    """Storage format of a feature mmap directory"""
+    metadata = Path(path) / METADATA_FILE
+    if metadata.exists():
+        return json.loads(metadata.read_text())["format"]
+    return "float32"
+
+
+class CompactRaggedMmap:
+    """Read-only RaggedMmap look-alike that returns dequantized float32 spectrograms"""
+
+    def __init__(self, path, **kwargs):
+        from mmap_ninja.ragged import RaggedMmap
+
+        self.path = Path(path)
+        self.format = feature_format(self.path)
+        self.raw = RaggedMmap(self.path, **kwargs)
+        self.scales = None
+        if self.format == "uint8":
+            # Two float32 values per feature; small enough to keep in memory
+            self.scales = np.load(self.path / SCALES_FILE)
+
+    def __len__(self):
+        return len(self.raw)
+
+    def _get_single(self, index):
+        params = self.scales[index] if self.scales is not None else None
+        return dequantize(self.raw[index], params)
+
+    def __getitem__(self, item):
+        if np.isscalar(item):
+            return self._get_single(int(item))
+        indices = np.arange(len(self))[item]
+        return [self._get_single(int(index)) for index in indices]
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self._get_single(index)
+
+
+def open_features(path, **kwargs):
+    """Open a feature mmap directory in whatever format it was written, warming its page cache"""
+    from feature_prefetch import start_prefetch
+
+    start_prefetch(path)
+    if feature_format(path) != "float32":
+        return CompactRaggedMmap(path, **kwargs)
+
+    from mmap_ninja.ragged import RaggedMmap
+    return RaggedMmap(path, **kwargs)
+
+
+def install_reader():
+    """Make microWakeWord's data loader open compact feature mmaps transparently"""
+    import microwakeword.data
+    microwakeword.data.RaggedMmap = open_features
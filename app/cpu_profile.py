@@ -0,0 +1,214 @@
+"""
+CPU Training Profile
+Gives each concurrent CPU training run a disjoint set of cores, matching
+thread counts and, when a memory budget is configured, a batch size that
+fits it, and keeps a history of achieved steps/sec per core count.
+
+Cores are split evenly between max_concurrent runs even when only one is
+running: a lone run that took every core would hold them for its whole
+training, and a second job would wait for it to finish instead of
+starting on the other half. Set max_concurrent to 1 to give each run all
+cores and train jobs one after another.
+"""
+
+import os
+import json
+import time
+import shutil
+import logging
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+FLOAT_BYTES = 4
+
+# Share of a job's memory budget given to the batch; the rest is left for
+# dataset mmaps, weights and the runtime
+BATCH_MEMORY_FRACTION = 0.5
+
+MIN_BATCH_SIZE = 16
+HISTORY_LIMIT = 200
+
+
+def gpu_available():
+    """True if an NVIDIA GPU is visible to this container"""
+    return shutil.which('nvidia-smi') is not None and Path('/dev/nvidia0').exists()
+
+
+def available_memory():
+    """Memory available to this container in bytes (cgroup limit or MemAvailable)"""
+    limits = []
+    for path in ('/sys/fs/cgroup/memory.max', '/sys/fs/cgroup/memory/memory.limit_in_bytes'):
+        try:
+            value = Path(path).read_text().strip()
+        except OSError:
+            continue
+        if value.isdigit():
+            limits.append(int(value))
+
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    limits.append(int(line.split()[1]) * 1024)
+                    break
+    except OSError:
+        pass
+
+    return min(limits) if limits else None
+
+
+def sample_memory_bytes(frames, features, layer_filters, stride=1):
+    """
+    Training memory one sample adds to a batch: its float32 spectrogram and
+    the output of each conv layer (layer_filters channels over frames /
+    stride), kept for the backward pass, plus same-sized gradients
+    """
+    values = frames * features + sum(layer_filters) * (frames // stride)
+    return 2 * values * FLOAT_BYTES
+
+
+class CpuProfile:
+    """Execution settings for one training run pinned to a set of cores"""
+
+    def __init__(self, job_id, cores, batch_size):
+        self.job_id = job_id
+        self.cores = sorted(cores)
+        self.batch_size = batch_size
+
+    @property
+    def intra_op_threads(self):
+        return len(self.cores)
+
+    @property
+    def inter_op_threads(self):
+        return min(2, len(self.cores))
+
+    def env(self):
+        """Environment for the training process"""
+        threads = str(self.intra_op_threads)
+        return {
+            'CUDA_VISIBLE_DEVICES': '',
+            'OMP_NUM_THREADS': threads,
+            'MKL_NUM_THREADS': threads,
+            'TF_NUM_INTRAOP_THREADS': threads,
+            'TF_NUM_INTEROP_THREADS': str(self.inter_op_threads),
+        }
+
+    def to_dict(self):
+        return {
+            "job_id": self.job_id,
+            "cores": self.cores,
+            "batch_size": self.batch_size,
+            "intra_op_threads": self.intra_op_threads,
+            "inter_op_threads": self.inter_op_threads,
+        }
+
+
+class CpuScheduler:
+    """Hands out disjoint core sets to concurrent training runs"""
+
+    def __init__(self, history_path, cores_per_job=None, max_concurrent=2, memory_budget=None):
+        self.history_path = Path(history_path)
+        self.memory_budget = memory_budget or None  # bytes per run; None leaves batches as requested
+        self.cores = sorted(os.sched_getaffinity(0))
+        self.cores_per_job = max(1, min(
+            cores_per_job or len(self.cores) // max(1, max_concurrent),
+            len(self.cores)))
+        self._allocated = {}  # job_id -> CpuProfile
+        self._cond = threading.Condition()
+
+    def batch_size_for(self, requested, sample_bytes):
+        """
+        Largest power-of-two batch up to the requested size whose samples fit
+        the memory budget; the requested size when no budget is configured
+        """
+        if not self.memory_budget:
+            return requested
+        budget = min(filter(None, (self.memory_budget, available_memory()))) * BATCH_MEMORY_FRACTION
+        if requested * sample_bytes <= budget:
+            return requested
+        batch_size = MIN_BATCH_SIZE
+        while batch_size * 2 <= requested and batch_size * 2 * sample_bytes <= budget:
+            batch_size *= 2
+        return min(batch_size, requested)
+
+    def _free_cores(self):
+        used = {core for profile in self._allocated.values() for core in profile.cores}
+        return [core for core in self.cores if core not in used]
+
+    def acquire(self, job_id, batch_size, on_wait=None):
+        """Block until enough cores are free, then reserve them for job_id"""
+        with self._cond:
+            waited = False
+            while len(self._free_cores()) < self.cores_per_job:
+                if on_wait and not waited:
+                    on_wait()
+                waited = True
+                self._cond.wait()
+            profile = CpuProfile(job_id, self._free_cores()[:self.cores_per_job], batch_size)
+            self._allocated[job_id] = profile
+            logger.info(f"Job {job_id} pinned to cores {profile.cores}")
+            return profile
+
+    def release(self, job_id):
+        with self._cond:
+            self._allocated.pop(job_id, None)
+            self._cond.notify_all()
+
+    # ------------------------------------------------------------------
+    # Throughput history
+    # ------------------------------------------------------------------
+
+    def _load_history(self):
+        try:
+            return json.loads(self.history_path.read_text())
+        except (OSError, ValueError):
+            return []
+
+    def record_throughput(self, profile, steps, elapsed):
+        """Store achieved steps/sec for this core count and batch size"""
+        if not steps or elapsed <= 0:
+            return None
+        entry = {
+            "job_id": profile.job_id,
+            "cores": len(profile.cores),
+            "batch_size": profile.batch_size,
+            "steps": steps,
+            "seconds": round(elapsed, 1),
+            "steps_per_sec": round(steps / elapsed, 3),
+            "recorded_at": time.time(),
+        }
+        with self._cond:
+            history = self._load_history()
+            history.append(entry)
+            self.history_path.write_text(json.dumps(history[-HISTORY_LIMIT:], indent=2))
+        return entry
+
+    def throughput_by_cores(self):
+        """Mean steps/sec and steps/sec per core for each recorded core count"""
+        by_cores = {}
+        for entry in self._load_history():
+            by_cores.setdefault(entry["cores"], []).append(entry["steps_per_sec"])
+        return {
+            cores: {
+                "runs": len(rates),
+                "steps_per_sec": round(sum(rates) / len(rates), 3),
+                "steps_per_sec_per_core": round(sum(rates) / len(rates) / cores, 3),
+            }
+            for cores, rates in sorted(by_cores.items())
+        }
+
+    def report(self):
+        with self._cond:
+            allocated = [profile.to_dict() for profile in self._allocated.values()]
+            free = self._free_cores()
+        return {
+            "cores": self.cores,
+            "cores_per_job": self.cores_per_job,
+            "memory_budget_bytes": self.memory_budget,
+            "free_cores": free,
+            "allocated": allocated,
+            "throughput": self.throughput_by_cores(),
+        }
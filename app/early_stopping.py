@@ -0,0 +1,112 @@
+"""
+Early Stopping
+Follows microWakeWord's validation results in the training logs while the
+run is in progress and decides when to stop it: once average viable recall
+has plateaued for a number of evaluations, or at the nominal step budget
+unless it is still improving (up to a hard maximum)
+"""
+
+import os
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+RECALL_RE = re.compile(r"Step (\d+).*?average[ _]viable[ _]recall\s*=\s*([0-9.]+)", re.IGNORECASE)
+
+
+class EarlyStopping:
+    """Stopping policy over a sequence of (step, average viable recall) evaluations"""
+
+    def __init__(self, nominal_steps, max_steps=None, patience=3, min_delta=0.0, min_steps=0):
+        self.nominal_steps = nominal_steps
+        self.max_steps = max(max_steps or nominal_steps, nominal_steps)
+        self.patience = patience
+        self.min_delta = min_delta
+        self.min_steps = min_steps
+
+        self.history = []
+        self.best_step = None
+        self.best_recall = None
+        self.evals_without_improvement = 0
+        self.stop_reason = None
+
+    def update(self, step, recall):
+        """Record one evaluation; returns True when training should stop now"""
+        self.history.append({"step": step, "recall": recall})
+        previous_best = self.best_recall
+
+        if previous_best is None or recall > previous_best + self.min_delta:
+            self.evals_without_improvement = 0
+        else:
+            self.evals_without_improvement += 1
+
+        if previous_best is None or recall >= previous_best:
+            self.best_step, self.best_recall = step, recall
+            # microWakeWord is writing best_weights for this evaluation;
+            # never stop while that file may be half written
+            return False
+
+        if step < self.min_steps or step >= self.max_steps:
+            return False
+
+        if self.patience and self.evals_without_improvement >= self.patience:
+            self.stop_reason = f"no improvement in {self.evals_without_improvement} evaluations"
+        elif step >= self.nominal_steps:
+            self.stop_reason = "stopped improving after the nominal step budget"
+        return self.stop_reason is not None
+
+    def report(self, steps_run, seconds):
+        """Summary of the run, including the compute saved against max_steps"""
+        steps_saved = max(self.max_steps - steps_run, 0)
+        return {
+            "nominal_steps": self.nominal_steps,
+            "max_steps": self.max_steps,
+            "steps_run": steps_run,
+            "steps_saved": steps_saved,
+            "seconds": round(seconds, 1),
+            "seconds_saved_estimate": round(seconds / steps_run * steps_saved, 1) if steps_run else 0.0,
+            "best_step": self.best_step,
+            "best_recall": self.best_recall,
+            "stopped_early": self.stop_reason is not None,
+            "stop_reason": self.stop_reason,
+            "evaluations": self.history,
+        }
+
+
+class TrainingMonitor:
+    """Tails the training logs and feeds validation results to an EarlyStopping policy"""
+
+    def __init__(self, log_paths, policy, on_eval=None):
+        self.policy = policy
+        self.on_eval = on_eval
+        self.stop_requested = False
+        self._offsets = {str(path): 0 for path in log_paths}
+        self._partial = {str(path): "" for path in log_paths}
+
+    def _new_lines(self, path):
+        if not os.path.exists(path):
+            return []
+        with open(path, errors='replace') as f:
+            f.seek(self._offsets[path])
+            data = f.read()
+            self._offsets[path] = f.tell()
+        lines = (self._partial[path] + data).split("\n")
+        self._partial[path] = lines.pop()
+        return lines
+
+    def should_stop(self):
+        """Read what the run logged since the last call; True once it should be stopped"""
+        for path in self._offsets:
+            for line in self._new_lines(path):
+                match = RECALL_RE.search(line)
+                if not match or self.stop_requested:
+                    continue
+                step, recall = int(match.group(1)), float(match.group(2))
+                self.stop_requested = self.policy.update(step, recall)
+                if self.on_eval:
+                    try:
+                        self.on_eval(step, recall, self.policy)
+                    except Exception as e:
+                        logger.warning(f"Evaluation callback failed: {e}")
+        return self.stop_requested
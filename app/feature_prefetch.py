@@ -0,0 +1,48 @@
+"""
+Feature Prefetch
+Warms the page cache for a feature mmap's data file on a background thread
+when training opens it through the RaggedMmap hook. microWakeWord samples
+by index, so reads stay random, but once data.ninja is cached they no
+longer hit disk. The directories keep mmap_ninja's stock layout, so
+anything that reads RaggedMmap can still open them.
+"""
+
+import os
+import threading
+from pathlib import Path
+
+DATA_FILE = "data.ninja"
+
+PREFETCH_CHUNK_BYTES = 8 * 1024 * 1024
+
+
+def prefetch_limit():
+    """Bytes to warm per feature mmap (FEATURE_PREFETCH_BYTES, 0 disables)"""
+    return int(os.environ.get('FEATURE_PREFETCH_BYTES', 1024 * 1024 * 1024))
+
+
+def start_prefetch(mmap_dir, max_bytes=None):
+    """Read the start of mmap_dir's data file into the page cache in the background"""
+    max_bytes = prefetch_limit() if max_bytes is None else max_bytes
+    data_path = Path(mmap_dir) / DATA_FILE
+    if not max_bytes or not data_path.is_file():
+        return None
+
+    def prefetch():
+        with open(data_path, 'rb', buffering=0) as f:
+            fd = f.fileno()
+            end = min(max_bytes, os.fstat(fd).st_size)
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(fd, 0, end, os.POSIX_FADV_WILLNEED)
+            buffer = bytearray(PREFETCH_CHUNK_BYTES)
+            done = 0
+            # Reading the pages makes sure they are cached now, not just scheduled
+            while done < end:
+                read = f.readinto(memoryview(buffer)[:min(PREFETCH_CHUNK_BYTES, end - done)])
+                if not read:
+                    break
+                done += read
+
+    thread = threading.Thread(target=prefetch, daemon=True)
+    thread.start()
+    return thread
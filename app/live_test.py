@@ -0,0 +1,213 @@
+"""
+Live Detection Test
+Runs a trained streaming model on 16 kHz PCM streamed from the browser,
+one 10 ms microfrontend frame at a time, with per-session interpreter
+state so several testers can share the server
+"""
+
+import sys
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from blocking import green, run_blocking
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+BYTES_PER_CHUNK = 160 * 2  # 10 ms of 16-bit mono audio per microfrontend step
+MAX_PENDING_CHUNKS = 50    # audio messages queued per session before dropping the oldest
+
+
+class LiveTestError(RuntimeError):
+    """Raised when a live test session cannot be started or used"""
+
+
+def load_interpreter(model_path):
+    """TFLite interpreter for the model, from whichever runtime is installed"""
+    try:
+        from tflite_runtime.interpreter import Interpreter
+    except ImportError:
+        # Under eventlet this runs on the blocking-work pool, where importing
+        # TensorFlow for the first time would give it green locks (see blocking.py)
+        if green() and 'tensorflow' not in sys.modules:
+            raise LiveTestError("No TFLite runtime available (install tflite-runtime)")
+        try:
+            from tensorflow.lite import Interpreter
+        except ImportError:
+            raise LiveTestError("No TFLite runtime available (install tensorflow or tflite-runtime)")
+
+    interpreter = Interpreter(model_path=str(model_path), num_threads=1)
+    interpreter.allocate_tensors()
+    return interpreter
+
+
+class LiveTestSession:
+    """Streaming inference state for one connected tester"""
+
+    def __init__(self, model_path, probability_cutoff, sliding_window_size):
+        from pymicro_features import MicroFrontend
+
+        self.interpreter = load_interpreter(model_path)
+        self.frontend = MicroFrontend()
+        self.probability_cutoff = probability_cutoff
+
+        input_details = self.interpreter.get_input_details()[0]
+        output_details = self.interpreter.get_output_details()[0]
+        self.input_index = input_details["index"]
+        self.input_dtype = input_details["dtype"]
+        self.input_shape = input_details["shape"]
+        self.input_scale, self.input_zero_point = input_details["quantization"]
+        self.output_index = output_details["index"]
+        self.output_scale, self.output_zero_point = output_details["quantization"]
+        self.stride = int(self.input_shape[1])
+
+        self.audio = b""
+        self.features = []
+        self.window = deque(maxlen=sliding_window_size)
+        self.frames = 0
+        self.detections = 0
+
+        # Chunks are processed in order by at most one executor task at a time
+        self.pending = deque()
+        self.lock = threading.Lock()
+        self.draining = False
+        self.closed = False
+
+    def _infer(self):
+        features = np.array(self.features[:self.stride], dtype=np.float32).reshape(self.input_shape)
+        if self.input_scale:
+            features = np.round(features / self.input_scale + self.input_zero_point)
+        self.interpreter.set_tensor(self.input_index, features.astype(self.input_dtype))
+        self.interpreter.invoke()
+
+        output = self.interpreter.get_tensor(self.output_index)[0][0]
+        if self.output_scale:
+            return float((output - self.output_zero_point) * self.output_scale)
+        return float(output)
+
+    def process(self, pcm):
+        """Feed PCM bytes; returns per-inference probabilities and detections"""
+        self.audio += pcm
+        probabilities, detections = [], []
+
+        offset = 0
+        while offset + BYTES_PER_CHUNK <= len(self.audio):
+            result = self.frontend.process_samples(self.audio[offset:offset + BYTES_PER_CHUNK])
+            offset += result.samples_read * 2
+            if not result.features:
+                continue
+
+            self.frames += 1
+            self.features.append(result.features)
+            if len(self.features) < self.stride:
+                continue
+
+            probability = self._infer()
+            self.features = self.features[self.stride:]
+            self.window.append(probability)
+            probabilities.append(round(probability, 4))
+
+            if (len(self.window) == self.window.maxlen
+                    and sum(self.window) / len(self.window) > self.probability_cutoff):
+                self.detections += 1
+                detections.append({"frame": self.frames, "time_s": round(self.frames * 0.01, 2)})
+                # Do not report the same utterance again
+                self.window.clear()
+
+        self.audio = self.audio[offset:]
+        return probabilities, detections
+
+
+class LiveTestManager:
+    """Live test sessions keyed by Socket.IO sid, processed on a bounded pool"""
+
+    def __init__(self, max_sessions=8, workers=4):
+        self.max_sessions = max_sessions
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="live-test")
+
+    def start(self, sid, model_path, probability_cutoff, sliding_window_size, on_ready, on_error):
+        """Load the model for a session off the request thread"""
+        with self._lock:
+            if sid not in self._sessions and len(self._sessions) >= self.max_sessions:
+                raise LiveTestError(f"Too many live test sessions (max {self.max_sessions})")
+            self._sessions[sid] = None  # reserve the slot while loading
+
+        def load():
+            try:
+                session = run_blocking(LiveTestSession, model_path, probability_cutoff, sliding_window_size)
+            except Exception as e:
+                logger.error(f"Live test for {sid} failed to start: {e}")
+                self.stop(sid)
+                on_error(str(e))
+                return
+            with self._lock:
+                if sid not in self._sessions:
+                    return  # stopped while loading
+                self._sessions[sid] = session
+            on_ready({"stride": session.stride, "sample_rate": SAMPLE_RATE})
+
+        self._executor.submit(load)
+
+    def submit(self, sid, seq, sent_at, pcm, on_result):
+        """Queue an audio chunk; results are delivered through on_result in order"""
+        received_at = time.time()
+        with self._lock:
+            session = self._sessions.get(sid)
+        if session is None:
+            raise LiveTestError("No live test session is running")
+
+        with session.lock:
+            if len(session.pending) >= MAX_PENDING_CHUNKS:
+                session.pending.popleft()
+            session.pending.append((seq, sent_at, received_at, pcm))
+            if session.draining:
+                return
+            session.draining = True
+
+        self._executor.submit(self._drain, session, on_result)
+
+    def _drain(self, session, on_result):
+        while True:
+            with session.lock:
+                if not session.pending or session.closed:
+                    session.draining = False
+                    return
+                seq, sent_at, received_at, pcm = session.pending.popleft()
+
+            started = time.time()
+            try:
+                probabilities, detections = run_blocking(session.process, pcm)
+            except Exception as e:
+                logger.error(f"Live test inference failed: {e}")
+                on_result({"seq": seq, "error": str(e)})
+                continue
+
+            finished = time.time()
+            on_result({
+                "seq": seq,
+                "client_sent_at": sent_at,
+                "probabilities": probabilities,
+                "detections": detections,
+                "total_detections": session.detections,
+                "queue_ms": round((started - received_at) * 1000, 2),
+                "inference_ms": round((finished - started) * 1000, 2),
+            })
+
+    def stop(self, sid):
+        with self._lock:
+            session = self._sessions.pop(sid, None)
+        if session is not None:
+            with session.lock:
+                session.closed = True
+                session.pending.clear()
+
+    def active_sessions(self):
+        with self._lock:
+            return len(self._sessions)
@@ -4,17 +4,31 @@ A web-based interface for training custom wake words for Home Assistant
 """
 
 from flask import Flask, render_template, request, jsonify, send_file, send_from_directory
-from flask_socketio import SocketIO, emit
+from flask_socketio import SocketIO, emit, join_room
 import os
 import json
 import uuid
+import hashlib
 import subprocess
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 import shutil
+import tempfile
+import zipfile
 import logging
 
+from storage import StorageManager, StorageQuotaExceeded
+from training_worker import TrainingWorker, WorkerUnavailable, run_cold, STDOUT_LOG, STDERR_LOG
+from early_stopping import EarlyStopping, TrainingMonitor
+from compact_features import FORMATS as FEATURE_FORMATS
+from sample_filter import filter_samples
+from live_test import LiveTestManager, LiveTestError
+from cpu_profile import CpuScheduler, gpu_available, sample_memory_bytes
+from blocking import green, run_blocking
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -25,7 +39,9 @@ app = Flask(__name__,
 app.config['SECRET_KEY'] = 'wake-word-trainer-secret-key'
 app.config['MAX_CONTENT_LENGTH'] = 500 * 1024 * 1024  # 500MB max upload
 
-socketio = SocketIO(app, cors_allowed_origins="*")
+# eventlet only when serve.py has monkey-patched the process; the
+# development server runs training threads as real OS threads
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode='eventlet' if green() else 'threading')
 
 # Directories
 BASE_DIR = Path(__file__).parent.parent
@@ -39,12 +55,81 @@ TRAINING_JOBS_DIR.mkdir(exist_ok=True)
 
 # Training jobs storage
 training_jobs = {}
+training_batches = {}
+
+# Identical submissions attach to in-flight or recently completed jobs
+job_fingerprints = {}
+coalesce_lock = threading.Lock()
+COALESCE_WINDOW_HOURS = float(os.environ.get('COALESCE_WINDOW_HOURS', 24))
+
+# Limits for batch (multi wake word) training
+MAX_BATCH_WAKE_WORDS = 10
+BATCH_SYNTHESIS_WORKERS = int(os.environ.get('BATCH_SYNTHESIS_WORKERS', 4))
+
+
+def _env_int(name):
+    value = os.environ.get(name)
+    return int(value) if value else None
+
+
+def is_job_active(job_id):
+    """True while a job (or a batch's shared data) may still be written to"""
+    job = training_jobs.get(job_id) or training_batches.get(job_id)
+    return job is not None and job.status in ("pending", "running")
+
+
+# Disk quotas and garbage collection for training_jobs
+storage = StorageManager(
+    TRAINING_JOBS_DIR,
+    global_quota=_env_int('STORAGE_QUOTA_BYTES'),
+    job_quota=_env_int('JOB_QUOTA_BYTES'),
+    max_age_hours=_env_int('STORAGE_MAX_AGE_HOURS'),
+    is_active=is_job_active,
+)
+
+
+def job_fingerprint(wake_word, method, config, negatives=False):
+    """
+    Identity of a training request: normalized wake word, method, effective
+    config and training data. Batch members train against the shared
+    negative datasets and single jobs do not, so they never coalesce.
+    """
+    payload = json.dumps({
+        "wake_word": " ".join(wake_word.lower().split()),
+        "method": method,
+        "config": config,
+        "negative_features": negatives,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def find_coalescable_job(fingerprint):
+    """An in-flight or recently completed job with the same fingerprint, if any"""
+    job = training_jobs.get(job_fingerprints.get(fingerprint))
+    if not job:
+        return None
+
+    if job.status in ("pending", "running"):
+        return job
+
+    if job.status == "completed" and job.completed_at:
+        age_hours = (datetime.now() - job.completed_at).total_seconds() / 3600
+        if age_hours <= COALESCE_WINDOW_HOURS and job.model_path and Path(job.model_path).exists():
+            return job
+
+    return None
+
+
+def register_job(job):
+    """Track a new job and make it the target for identical submissions"""
+    training_jobs[job.job_id] = job
+    job_fingerprints[job.fingerprint] = job.job_id
 
 
 class TrainingJob:
     """Represents a wake word training job"""
 
-    def __init__(self, job_id, wake_word, method, config, author="", website=""):
+    def __init__(self, job_id, wake_word, method, config, author="", website="", batch_id=None):
         self.job_id = job_id
         self.wake_word = wake_word
         self.method = method
@@ -58,10 +143,20 @@ class TrainingJob:
         self.completed_at = None
         self.model_path = None
         self.error = None
+        self.batch_id = batch_id
+        self.fingerprint = job_fingerprint(wake_word, method, config, negatives=batch_id is not None)
+        self.coalesced_requests = 0
+        self.sample_report = None
+        self.training_report = None
         
     def to_dict(self):
         return {
             "job_id": self.job_id,
+            "batch_id": self.batch_id,
+            "fingerprint": self.fingerprint,
+            "coalesced_requests": self.coalesced_requests,
+            "sample_report": self.sample_report,
+            "training_report": self.training_report,
             "wake_word": self.wake_word,
             "method": self.method,
             "status": self.status,
@@ -70,12 +165,46 @@ class TrainingJob:
             "created_at": self.created_at.isoformat(),
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
             "model_path": str(self.model_path) if self.model_path else None,
-            "error": self.error
+            "error": self.error,
+            "disk_usage_bytes": storage.job_usage(self.job_id)
+        }
+
+
+class TrainingBatch:
+    """A family of wake words trained from one shared data pipeline"""
+
+    def __init__(self, batch_id, job_ids, config):
+        self.batch_id = batch_id
+        self.job_ids = job_ids
+        self.config = config
+        self.status = "pending"
+        self.created_at = datetime.now()
+        self.completed_at = None
+        self.error = None
+
+    def to_dict(self):
+        jobs = [training_jobs[job_id] for job_id in self.job_ids]
+        return {
+            "batch_id": self.batch_id,
+            "status": self.status,
+            "progress": round(sum(job.progress for job in jobs) / len(jobs)),
+            "created_at": self.created_at.isoformat(),
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "error": self.error,
+            "jobs": [
+                {
+                    "job_id": job.job_id,
+                    "wake_word": job.wake_word,
+                    "status": job.status,
+                    "progress": job.progress,
+                }
+                for job in jobs
+            ]
         }
 
 
 def emit_progress(job_id, progress, message, status=None):
-    """Emit progress update via WebSocket"""
+    """Emit a progress update to the clients subscribed to the job"""
     job = training_jobs.get(job_id)
     if job:
         job.progress = progress
@@ -88,8 +217,19 @@ def emit_progress(job_id, progress, message, status=None):
             'progress': progress,
             'message': message,
             'status': job.status,
-            'logs': job.logs[-50:]
-        })
+            'logs': job.logs[-50:],
+            'sent_at': time.time()
+        }, to=job_id)
+
+        if job.batch_id:
+            emit_batch_progress(job.batch_id)
+
+
+def emit_batch_progress(batch_id):
+    """Emit combined progress to the clients subscribed to the batch"""
+    batch = training_batches.get(batch_id)
+    if batch:
+        socketio.emit('batch_progress', batch.to_dict(), to=batch_id)
 
 
 def generate_model_json(job_id, model_file_path):
@@ -128,6 +268,70 @@ def generate_model_json(job_id, model_file_path):
     return json_path
 
 
+# Warm fork server for microWakeWord training ("warm" or "cold")
+TRAINING_WORKER_MODE = os.environ.get('TRAINING_WORKER', 'warm')
+training_worker = TrainingWorker()
+
+
+# Live detection tests streamed from the browser
+live_tests = LiveTestManager(
+    max_sessions=_env_int('LIVE_TEST_MAX_SESSIONS') or 8,
+    workers=_env_int('LIVE_TEST_WORKERS') or 4,
+)
+
+# Training device ("auto", "cpu" or "gpu"); CPU runs are pinned to disjoint cores
+TRAINING_DEVICE = os.environ.get('TRAINING_DEVICE', 'auto')
+cpu_scheduler = CpuScheduler(
+    TRAINING_JOBS_DIR / "_cpu_throughput.json",
+    cores_per_job=_env_int('TRAINING_CORES_PER_JOB'),
+    max_concurrent=_env_int('TRAINING_MAX_CONCURRENT') or 2,
+    memory_budget=_env_int('TRAINING_MEMORY_BYTES'),
+)
+
+# Model input (1.5 s clips at a 10 ms window step, 40 features) and the
+# mixednet layout passed to the trainer; sizes batches against the memory budget
+CLIP_FRAMES = 150
+FEATURE_BINS = 40
+MIXEDNET_FIRST_CONV_FILTERS = 32
+MIXEDNET_POINTWISE_FILTERS = (64, 64, 64, 64)
+MIXEDNET_STRIDE = 3
+
+
+def cpu_scheduler_concurrency():
+    """Number of CPU training runs that can hold cores at the same time"""
+    return max(1, len(cpu_scheduler.cores) // cpu_scheduler.cores_per_job)
+
+
+def use_cpu_training():
+    if TRAINING_DEVICE == 'auto':
+        return not gpu_available()
+    return TRAINING_DEVICE == 'cpu'
+
+
+def run_training(args, cwd, env, timeout, cpu_affinity=None, should_stop=None):
+    """Run microWakeWord training, reusing the warm worker when it is available"""
+    if TRAINING_WORKER_MODE == 'warm':
+        try:
+            return training_worker.run(args, cwd=cwd, env=env, timeout=timeout,
+                                       cpu_affinity=cpu_affinity, should_stop=should_stop)
+        except WorkerUnavailable as e:
+            logger.warning(f"Falling back to a cold training process: {e}")
+
+    # Run through the worker script so compact feature formats are readable
+    return run_cold(args, cwd=cwd, env=env, timeout=timeout,
+                    cpu_affinity=cpu_affinity, should_stop=should_stop)
+
+
+def finish_job_storage(job_id):
+    """Account for a finished job's final outputs and apply the retention policy"""
+    try:
+        storage.record(job_id)
+        storage.touch(job_id)
+        storage.collect(target_bytes=storage.global_quota)
+    except Exception as e:
+        logger.warning(f"Storage bookkeeping failed for job {job_id}: {e}")
+
+
 def train_openwakeword(job_id, wake_word, config):
     """Train using OpenWakeWord method (Google Colab simulation)"""
     job = training_jobs[job_id]
@@ -181,7 +385,9 @@ except Exception as e:
         
         if result.returncode != 0:
             raise Exception(f"Sample generation failed: {result.stderr}")
-        
+
+        storage.charge(job_id, "samples")
+
         emit_progress(job_id, 60, "Training wake word model...")
         
         # Simulate training (in real scenario, this would use actual training)
@@ -252,93 +458,185 @@ Generated samples are in: {samples_dir}
         job.error = str(e)
         emit_progress(job_id, 0, f"Training failed: {e}", "failed")
 
-
-def train_microwakeword(job_id, wake_word, config):
-    """Train using MicroWakeWord method"""
-    job = training_jobs[job_id]
-    job_dir = TRAINING_JOBS_DIR / job_id
-    job_dir.mkdir(exist_ok=True)
-    
-    try:
-        emit_progress(job_id, 10, "Initializing MicroWakeWord training...", "running")
-
-        # microWakeWord is pre-installed in the Docker image
-        if not MICROWAKEWORD_DIR.exists():
-            raise RuntimeError("microWakeWord directory not found. Please rebuild the Docker image.")
-
-        # Generate samples
-        num_samples = config.get('num_samples', 2000)
-        emit_progress(job_id, 30, f"Generating {num_samples} voice samples...")
-
-        samples_dir = job_dir / "samples" / "positive"
-        samples_dir.mkdir(parents=True, exist_ok=True)
-
-        # Use piper-sample-generator script with default voice model
-        result = subprocess.run([
-            "python3", "/app/piper-sample-generator/generate_samples.py",
-            wake_word,
-            "--model", "/app/voices/en_US-lessac-medium.onnx",
-            "--max-samples", str(num_samples),
-            "--output-dir", str(samples_dir)
-        ], capture_output=True, text=True, timeout=900)
-
-        if result.returncode != 0:
-            logger.error(f"Sample generation failed:\nSTDOUT: {result.stdout}\nSTDERR: {result.stderr}")
-            raise subprocess.CalledProcessError(result.returncode, result.args, result.stdout, result.stderr)
-        
-        emit_progress(job_id, 50, "Downloading negative datasets...")
-        
-        # Download datasets
-        datasets_dir = job_dir / "datasets"
-        datasets_dir.mkdir(exist_ok=True)
-        
-        download_script = f"""
+    finally:
+        finish_job_storage(job_id)
+
+
+def generate_positive_samples(wake_word, num_samples, samples_dir):
+    """Synthesize positive samples for a wake word with piper"""
+    samples_dir.mkdir(parents=True, exist_ok=True)
+
+    # Use piper-sample-generator script with default voice model
+    result = subprocess.run([
+        "python3", "/app/piper-sample-generator/generate_samples.py",
+        wake_word,
+        "--model", "/app/voices/en_US-lessac-medium.onnx",
+        "--max-samples", str(num_samples),
+        "--output-dir", str(samples_dir)
+    ], capture_output=True, text=True, timeout=900)
+
+    if result.returncode != 0:
+        logger.error(f"Sample generation failed:\nSTDOUT: {result.stdout}\nSTDERR: {result.stderr}")
+        raise subprocess.CalledProcessError(result.returncode, result.args, result.stdout, result.stderr)
+
+
+# Trim silence and drop empty, clipped and near-duplicate clips before featurizing
+SAMPLE_FILTER = os.environ.get('SAMPLE_FILTER', '1') == '1'
+
+
+def clean_samples(job_id, samples_dir):
+    """Filter a job's synthesized samples and report how many were kept"""
+    if not SAMPLE_FILTER:
+        return
+
+    report = run_blocking(filter_samples, samples_dir)
+    logger.info(f"Job {job_id}: sample filter on {samples_dir}: {report}")
+    training_jobs[job_id].sample_report = report
+    if not report["kept"]:
+        raise RuntimeError(f"No usable samples left after filtering: {report}")
+
+    emit_progress(job_id, 45, f"Kept {report['kept']} of {report['total']} samples "
+                              f"({report['empty']} empty, {report['clipped']} clipped, "
+                              f"{report['duplicates']} near-duplicates removed)")
+
+
+# Negative feature sets in kahrendt/microwakeword, each shipped as <name>.zip
+# holding a <name>/ mmap tree; sampling weights and truncation follow
+# microWakeWord's basic training notebook
+NEGATIVE_DATASETS = [
+    ("speech", 10.0, "random"),
+    ("dinner_party", 10.0, "random"),
+    ("no_speech", 5.0, "random"),
+    ("dinner_party_eval", 0.0, "split"),
+]
+
+
+def extract_negative_dataset(archive, target):
+    """Unzip one negative dataset into target, replacing the archive"""
+    partial = target.with_name(f".{target.name}.partial")
+    shutil.rmtree(partial, ignore_errors=True)
+    with zipfile.ZipFile(archive) as zf:
+        zf.extractall(partial)
+    extracted = partial / target.name
+    (extracted if extracted.is_dir() else partial).rename(target)
+    shutil.rmtree(partial, ignore_errors=True)
+    archive.unlink()
+
+
+def download_negative_datasets(work_dir, datasets_dir, extract=False):
+    """
+    Download the pre-generated negative feature datasets. With extract, fetch
+    the zipped feature sets and unzip them once into datasets_dir/<name> for
+    training; later calls reuse the extracted directories.
+    """
+    datasets_dir.mkdir(parents=True, exist_ok=True)
+    if extract and all((datasets_dir / name).is_dir() for name, _, _ in NEGATIVE_DATASETS):
+        return
+
+    allow_patterns = ["*.zip"] if extract else ["*.ragged", "*.json"]
+    download_script = f"""
 from huggingface_hub import snapshot_download
 
 snapshot_download(
     repo_id="kahrendt/microwakeword",
     repo_type="dataset",
     local_dir="{datasets_dir}",
-    allow_patterns=["*.ragged", "*.json"]
+    allow_patterns={allow_patterns!r}
 )
 """
-        
-        download_path = job_dir / "download.py"
-        download_path.write_text(download_script)
-        
-        # Install huggingface_hub
-        subprocess.run([
-            "pip", "install", "--break-system-packages", "-q", "huggingface_hub"
-        ], check=True)
-        
-        subprocess.run(
-            ["python3", str(download_path)],
-            check=True,
-            capture_output=True,
+
+    download_path = work_dir / "download.py"
+    download_path.write_text(download_script)
+
+    # Install huggingface_hub
+    subprocess.run([
+        "pip", "install", "--break-system-packages", "-q", "huggingface_hub"
+    ], check=True)
+
+    subprocess.run(
+        ["python3", str(download_path)],
+        check=True,
+        capture_output=True,
+        timeout=3600
+    )
+
+    if extract:
+        for name, _, _ in NEGATIVE_DATASETS:
+            archive = datasets_dir / f"{name}.zip"
+            if archive.exists() and not (datasets_dir / name).exists():
+                run_blocking(extract_negative_dataset, archive, datasets_dir / name)
+
+
+def negative_feature_entries(datasets_dir):
+    """Training config feature entries for the extracted negative datasets"""
+    entries = [
+        {
+            "features_dir": str(datasets_dir / name),
+            "sampling_weight": sampling_weight,
+            "penalty_weight": 1.0,
+            "truth": False,
+            "truncation_strategy": truncation_strategy,
+            "type": "mmap",
+        }
+        for name, sampling_weight, truncation_strategy in NEGATIVE_DATASETS
+        if (datasets_dir / name).is_dir()
+    ]
+    if not entries:
+        raise RuntimeError(f"No negative feature datasets found in {datasets_dir}")
+    return entries
+
+
+def generate_features(samples_dir, output_dir, feature_format="float32"):
+    """Generate spectrograms via the feature generator service (separate container with PyTorch)"""
+    import requests
+
+    feature_generator_url = os.environ.get('FEATURE_GENERATOR_URL', 'http://feature-generator:5001')
+
+    logger.info(f"Calling feature generator service at {feature_generator_url}")
+
+    try:
+        response = requests.post(
+            f"{feature_generator_url}/generate-features",
+            json={
+                "samples_dir": str(samples_dir),
+                "output_dir": str(output_dir),
+                "feature_format": feature_format
+            },
             timeout=3600
         )
-        
-        emit_progress(job_id, 70, "Creating training configuration...")
-        
-        # Create training config
-        training_config = {
-            "wake_word": wake_word,
-            "model_id": wake_word.replace(" ", "_"),
-            "positive_samples_dir": str(samples_dir),
-            "negative_datasets_dir": str(datasets_dir),
-            "output_dir": str(job_dir / "models"),
-            "epochs": config.get('epochs', 30),
-            "batch_size": config.get('batch_size', 512),
-            "learning_rate": config.get('learning_rate', 0.001),
-            "probability_cutoff": config.get('probability_cutoff', 0.97),
-            "sliding_window_size": config.get('sliding_window_size', 5)
-        }
-        
-        config_path = job_dir / "training_config.json"
-        config_path.write_text(json.dumps(training_config, indent=2))
-        
-        # Create instructions for actual training
-        instructions = f"""
+
+        if response.status_code != 200:
+            raise RuntimeError(f"Feature generation failed: {response.text}")
+
+        result = response.json()
+        logger.info(f"Feature generation complete: {result}")
+
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Failed to connect to feature generator: {e}")
+        raise RuntimeError(f"Failed to connect to feature generator service: {e}")
+
+
+def write_training_instructions(job_dir, wake_word, config, num_samples, samples_dir, datasets_dir):
+    """Write the training config, manual training instructions and ESPHome example"""
+    # Create training config
+    training_config = {
+        "wake_word": wake_word,
+        "model_id": wake_word.replace(" ", "_"),
+        "positive_samples_dir": str(samples_dir),
+        "negative_datasets_dir": str(datasets_dir),
+        "output_dir": str(job_dir / "models"),
+        "epochs": config.get('epochs', 30),
+        "batch_size": config.get('batch_size', 512),
+        "learning_rate": config.get('learning_rate', 0.001),
+        "probability_cutoff": config.get('probability_cutoff', 0.97),
+        "sliding_window_size": config.get('sliding_window_size', 5)
+    }
+
+    config_path = job_dir / "training_config.json"
+    config_path.write_text(json.dumps(training_config, indent=2))
+
+    # Create instructions for actual training
+    instructions = f"""
 # MicroWakeWord Training Instructions
 
 Everything is prepared for training "{wake_word}"!
@@ -379,14 +677,12 @@ Copy these to your Home Assistant ESPHome device!
 
 Training data is in: {job_dir}
 """
-        
-        instructions_path = job_dir / "TRAINING_INSTRUCTIONS.md"
-        instructions_path.write_text(instructions)
-        
-        emit_progress(job_id, 90, "Creating deployment instructions...")
-        
-        # Create ESPHome config example
-        esphome_config = f"""
+
+    instructions_path = job_dir / "TRAINING_INSTRUCTIONS.md"
+    instructions_path.write_text(instructions)
+
+    # Create ESPHome config example
+    esphome_config = f"""
 # ESPHome Configuration for "{wake_word}"
 
 micro_wake_word:
@@ -408,95 +704,106 @@ micro_wake_word:
     - voice_assistant.start:
         wake_word: !lambda return wake_word;
 """
-        
-        esphome_path = job_dir / "esphome_config.yaml"
-        esphome_path.write_text(esphome_config)
-        
-        # Start automated training
-        emit_progress(job_id, 60, "Starting automated training (this may take 1-3 hours)...")
 
-        # Import yaml here since it's needed for config
-        import yaml
+    esphome_path = job_dir / "esphome_config.yaml"
+    esphome_path.write_text(esphome_config)
 
-        model_id = wake_word.replace(" ", "_")
 
-        # Create YAML config for microWakeWord training
-        yaml_config = {
-            "window_step_ms": 10,
-            "train_dir": str(job_dir / "trained_models" / model_id),
-            "features": [
-                {
-                    "features_dir": str(samples_dir) + "_features",
-                    "sampling_weight": 1.0,
-                    "penalty_weight": 1.0,
-                    "truth": True,
-                    "truncation_strategy": "truncate_start",
-                    "type": "mmap",
-                },
-                # Temporarily removed negative datasets - training with positive samples only for initial test
-            ],
-            "training_steps": [1000],  # Reduced for initial testing
-            "positive_class_weight": [1],
-            "negative_class_weight": [20],
-            "learning_rates": [config.get('learning_rate', 0.001)],
-            "batch_size": config.get('batch_size', 128),
-            "time_mask_max_size": [0],
-            "time_mask_count": [0],
-            "freq_mask_max_size": [0],
-            "freq_mask_count": [0],
-            "eval_step_interval": 500,
-            "clip_duration_ms": 1500,
-            "target_minimization": 0.9,
-            "minimization_metric": None,
-            "maximization_metric": "average_viable_recall",
-        }
+def train_model(job_id, wake_word, config, samples_dir, negative_features=()):
+    """Train a microWakeWord model from generated features and return the model file"""
+    # Import yaml here since it's needed for config
+    import yaml
 
-        yaml_config_path = job_dir / "training_parameters.yaml"
-        with open(yaml_config_path, 'w') as f:
-            yaml.dump(yaml_config, f)
-
-        emit_progress(job_id, 65, "Generating spectrograms from positive samples (this may take 10-15 minutes)...")
-
-        # Call feature generator service (separate container with PyTorch)
-        import requests
-
-        feature_generator_url = os.environ.get('FEATURE_GENERATOR_URL', 'http://feature-generator:5001')
-        output_dir = str(samples_dir) + "_features"
-
-        logger.info(f"Calling feature generator service at {feature_generator_url}")
-
-        try:
-            response = requests.post(
-                f"{feature_generator_url}/generate-features",
-                json={
-                    "samples_dir": str(samples_dir),
-                    "output_dir": output_dir
-                },
-                timeout=3600
-            )
+    job_dir = TRAINING_JOBS_DIR / job_id
+    model_id = wake_word.replace(" ", "_")
+
+    # The YAML budget is the hard maximum; the monitor ends the run earlier
+    training_steps = config.get('training_steps', DEFAULT_TRAINING_STEPS)
+    max_training_steps = max(config.get('max_training_steps') or training_steps, training_steps)
+    early_stopping = EarlyStopping(
+        nominal_steps=training_steps,
+        max_steps=max_training_steps,
+        patience=config.get('early_stopping_patience', DEFAULT_EARLY_STOPPING_PATIENCE),
+        min_delta=config.get('early_stopping_min_delta', DEFAULT_EARLY_STOPPING_MIN_DELTA),
+    )
 
-            if response.status_code != 200:
-                raise RuntimeError(f"Feature generation failed: {response.text}")
+    # On CPU nodes with a memory budget, size the batch to fit it
+    cpu_training = use_cpu_training()
+    requested_batch_size = config.get('batch_size', 128)
+    batch_size = requested_batch_size
+    if cpu_training:
+        # Each block's depthwise mixconv keeps its input width, then the pointwise conv sets the next
+        widths = (MIXEDNET_FIRST_CONV_FILTERS, *MIXEDNET_POINTWISE_FILTERS)
+        layer_filters = (MIXEDNET_FIRST_CONV_FILTERS, *widths[:-1], *MIXEDNET_POINTWISE_FILTERS)
+        batch_size = cpu_scheduler.batch_size_for(
+            requested_batch_size,
+            sample_memory_bytes(CLIP_FRAMES, FEATURE_BINS, layer_filters, stride=MIXEDNET_STRIDE))
+
+    # Create YAML config for microWakeWord training
+    yaml_config = {
+        "window_step_ms": 10,
+        "train_dir": str(job_dir / "trained_models" / model_id),
+        "features": [
+            {
+                "features_dir": str(samples_dir) + "_features",
+                "sampling_weight": 1.0,
+                "penalty_weight": 1.0,
+                "truth": True,
+                "truncation_strategy": "truncate_start",
+                "type": "mmap",
+            },
+            *negative_features,
+        ],
+        "training_steps": [max_training_steps],
+        "positive_class_weight": [1],
+        "negative_class_weight": [20],
+        "learning_rates": [config.get('learning_rate', 0.001)],
+        "batch_size": batch_size,
+        "time_mask_max_size": [0],
+        "time_mask_count": [0],
+        "freq_mask_max_size": [0],
+        "freq_mask_count": [0],
+        "eval_step_interval": config.get('eval_step_interval', DEFAULT_EVAL_STEP_INTERVAL),
+        "clip_duration_ms": 1500,
+        "target_minimization": 0.9,
+        "minimization_metric": None,
+        "maximization_metric": "average_viable_recall",
+    }
 
-            result = response.json()
-            logger.info(f"Feature generation complete: {result}")
+    yaml_config_path = job_dir / "training_parameters.yaml"
+    with open(yaml_config_path, 'w') as f:
+        yaml.dump(yaml_config, f)
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to connect to feature generator: {e}")
-            raise RuntimeError(f"Failed to connect to feature generator service: {e}")
+    training_env = os.environ.copy()
+    cpu_profile = None
 
+    if cpu_training:
+        # Pin to a disjoint core set and match TensorFlow/OMP threads to it
+        cpu_profile = cpu_scheduler.acquire(
+            job_id, batch_size,
+            on_wait=lambda: emit_progress(job_id, 70, "Waiting for free CPU cores...")
+        )
+        training_env.update(cpu_profile.env())
+        emit_progress(job_id, 70, f"Training neural network on CPU cores {cpu_profile.cores} "
+                                  f"(batch size {batch_size})...")
+    else:
         emit_progress(job_id, 70, "Training neural network (GPU accelerated if available)...")
 
         # Set environment variables for TensorFlow GPU training
-        training_env = os.environ.copy()
         training_env['TF_FORCE_GPU_ALLOW_GROWTH'] = 'true'
         training_env['CUDA_VISIBLE_DEVICES'] = '0'  # Use first GPU
 
-        # Run training
-        training_result = subprocess.run([
-            "python3", "-m", "microwakeword.model_train_eval",
+    def on_eval(step, recall, policy):
+        progress = 70 + min(step / max_training_steps, 1.0) * 24
+        emit_progress(job_id, int(progress), f"Step {step}: average viable recall {recall:.4f} "
+                                             f"(best {policy.best_recall:.4f} at step {policy.best_step})")
+
+    monitor = TrainingMonitor([job_dir / STDOUT_LOG, job_dir / STDERR_LOG], early_stopping, on_eval)
+
+    def training_args(train):
+        return [
             f"--training_config={yaml_config_path}",
-            "--train", "1",
+            "--train", "1" if train else "0",
             "--restore_checkpoint", "1",
             "--test_tf_nonstreaming", "0",
             "--test_tflite_nonstreaming", "0",
@@ -505,45 +812,247 @@ micro_wake_word:
             "--test_tflite_streaming_quantized", "1",
             "--use_weights", "best_weights",
             "mixednet",
-            "--pointwise_filters", "64,64,64,64",
+            "--pointwise_filters", ",".join(map(str, MIXEDNET_POINTWISE_FILTERS)),
             "--repeat_in_block", "1,1,1,1",
             "--mixconv_kernel_sizes", "[5],[7,11],[9,15],[23]",
             "--residual_connection", "0,0,0,0",
-            "--first_conv_filters", "32",
+            "--first_conv_filters", str(MIXEDNET_FIRST_CONV_FILTERS),
             "--first_conv_kernel_size", "5",
-            "--stride", "3"
-        ], cwd=str(job_dir), capture_output=True, text=True, env=training_env, timeout=14400)
+            "--stride", str(MIXEDNET_STRIDE)
+        ]
 
-        if training_result.returncode != 0:
-            logger.error(f"Training failed:\nSTDOUT: {training_result.stdout}\nSTDERR: {training_result.stderr}")
-            raise RuntimeError(f"Training failed: {training_result.stderr}")
+    # Run training
+    cpu_affinity = cpu_profile.cores if cpu_profile else None
+    training_started = datetime.now()
+    try:
+        training_result = run_training(training_args(train=True), cwd=job_dir, env=training_env,
+                                       timeout=14400, cpu_affinity=cpu_affinity,
+                                       should_stop=monitor.should_stop)
+        elapsed = (datetime.now() - training_started).total_seconds()
+
+        if monitor.stop_requested:
+            # The stopped run never reached its test/export phase; export from best_weights
+            emit_progress(job_id, 94, f"Stopped early: {early_stopping.stop_reason}. Exporting best model...")
+            export_result = run_training(training_args(train=False), cwd=job_dir, env=training_env,
+                                         timeout=3600, cpu_affinity=cpu_affinity)
+            # Keep the training logs alongside the export's
+            for name, train_log, export_log in (
+                    (STDOUT_LOG, training_result.stdout, export_result.stdout),
+                    (STDERR_LOG, training_result.stderr, export_result.stderr)):
+                (job_dir / name).write_text(train_log + export_log)
+            training_result = export_result
+    finally:
+        if cpu_profile:
+            cpu_scheduler.release(job_id)
+
+    if training_result.returncode != 0:
+        logger.error(f"Training failed:\nSTDOUT: {training_result.stdout}\nSTDERR: {training_result.stderr}")
+        raise RuntimeError(f"Training failed: {training_result.stderr}")
+
+    steps_run = early_stopping.history[-1]["step"] if monitor.stop_requested else max_training_steps
+    report = early_stopping.report(steps_run, elapsed)
+    report["batch_size"] = batch_size
+    report["requested_batch_size"] = requested_batch_size
+    training_jobs[job_id].training_report = report
+    logger.info(f"Job {job_id}: trained {steps_run}/{max_training_steps} steps, "
+                f"saved ~{report['seconds_saved_estimate']}s")
+
+    if cpu_profile:
+        throughput = cpu_scheduler.record_throughput(cpu_profile, steps_run, elapsed)
+        if throughput:
+            logger.info(f"Job {job_id}: {throughput['steps_per_sec']} steps/sec "
+                        f"on {throughput['cores']} cores")
+
+    storage.charge(job_id, "trained_models")
+
+    emit_progress(job_id, 95, "Training complete! Finalizing model...")
+
+    # Find the generated model file
+    model_file = job_dir / "trained_models" / model_id / "tflite_stream_state_internal_quant" / "stream_state_internal_quant.tflite"
+
+    if not model_file.exists():
+        # Try alternate location
+        model_file = job_dir / "trained_models" / model_id / "stream_state_internal_quant.tflite"
+        if not model_file.exists():
+            logger.error(f"Model file not found. Searched: {model_file}")
+            raise RuntimeError("Model file not found after training")
 
-        emit_progress(job_id, 95, "Training complete! Finalizing model...")
+    # Generate JSON manifest for ESPHome
+    generate_model_json(job_id, model_file)
 
-        # Find the generated model file
-        model_file = job_dir / "trained_models" / model_id / "tflite_stream_state_internal_quant" / "stream_state_internal_quant.tflite"
+    return model_file
 
-        if not model_file.exists():
-            # Try alternate location
-            model_file = job_dir / "trained_models" / model_id / "stream_state_internal_quant.tflite"
-            if not model_file.exists():
-                logger.error(f"Model file not found. Searched: {model_file}")
-                raise RuntimeError("Model file not found after training")
 
-        # Generate JSON manifest for ESPHome
-        json_path = generate_model_json(job_id, model_file)
+def complete_job(job_id, model_path):
+    job = training_jobs[job_id]
+    job.model_path = model_path
+    job.status = "completed"
+    job.completed_at = datetime.now()
 
-        job.model_path = model_file
-        job.status = "completed"
-        job.completed_at = datetime.now()
+    emit_progress(job_id, 100, f"Training complete! Model and JSON manifest ready for deployment.", "completed")
+
+
+def fail_job(job_id, error):
+    logger.error(f"Setup failed for job {job_id}: {error}")
+    job = training_jobs[job_id]
+    job.status = "failed"
+    job.error = str(error)
+    emit_progress(job_id, 0, f"Setup failed: {error}", "failed")
+
+
+def train_microwakeword(job_id, wake_word, config):
+    """Train using MicroWakeWord method"""
+    job_dir = TRAINING_JOBS_DIR / job_id
+    job_dir.mkdir(exist_ok=True)
+    
+    try:
+        emit_progress(job_id, 10, "Initializing MicroWakeWord training...", "running")
+
+        # microWakeWord is pre-installed in the Docker image
+        if not MICROWAKEWORD_DIR.exists():
+            raise RuntimeError("microWakeWord directory not found. Please rebuild the Docker image.")
 
-        emit_progress(job_id, 100, f"Training complete! Model and JSON manifest ready for deployment.", "completed")
+        # Generate samples
+        num_samples = config.get('num_samples', 2000)
+        emit_progress(job_id, 30, f"Generating {num_samples} voice samples...")
+
+        samples_dir = job_dir / "samples" / "positive"
+        generate_positive_samples(wake_word, num_samples, samples_dir)
+        clean_samples(job_id, samples_dir)
+        storage.charge(job_id, "samples/positive")
+
+        emit_progress(job_id, 50, "Downloading negative datasets...")
+
+        datasets_dir = job_dir / "datasets"
+        download_negative_datasets(job_dir, datasets_dir)
+        storage.charge(job_id, "datasets")
+
+        emit_progress(job_id, 70, "Creating training configuration...")
+        write_training_instructions(job_dir, wake_word, config, num_samples, samples_dir, datasets_dir)
+        emit_progress(job_id, 90, "Creating deployment instructions...")
+
+        # Start automated training
+        emit_progress(job_id, 60, "Starting automated training (this may take 1-3 hours)...")
+        emit_progress(job_id, 65, "Generating spectrograms from positive samples (this may take 10-15 minutes)...")
+
+        generate_features(samples_dir, str(samples_dir) + "_features",
+                          config.get('feature_format', 'float32'))
+        storage.charge(job_id, "samples/positive_features")
+
+        # Temporarily training with positive samples only for initial test
+        model_file = train_model(job_id, wake_word, config, samples_dir)
+        complete_job(job_id, model_file)
         
     except Exception as e:
-        logger.error(f"Setup failed for job {job_id}: {e}")
-        job.status = "failed"
-        job.error = str(e)
-        emit_progress(job_id, 0, f"Setup failed: {e}", "failed")
+        fail_job(job_id, e)
+
+    finally:
+        finish_job_storage(job_id)
+
+
+def _run_batch_stage(job_ids, stage, workers):
+    """Run stage(job_id) for batch members in parallel; members that fail are dropped"""
+    if not job_ids:
+        return []
+    succeeded = set()
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(job_ids)))) as pool:
+        futures = {pool.submit(stage, job_id): job_id for job_id in job_ids}
+        for future in as_completed(futures):
+            job_id = futures[future]
+            try:
+                future.result()
+                succeeded.add(job_id)
+            except Exception as e:
+                fail_job(job_id, e)
+    return [job_id for job_id in job_ids if job_id in succeeded]
+
+
+def train_microwakeword_batch(batch_id):
+    """Train several wake words, sharing sample synthesis and negative datasets"""
+    batch = training_batches[batch_id]
+    config = batch.config
+    batch_dir = TRAINING_JOBS_DIR / batch_id
+    batch_dir.mkdir(exist_ok=True)
+    datasets_dir = batch_dir / "datasets"
+    num_samples = config.get('num_samples', 2000)
+    job_ids = list(batch.job_ids)
+
+    def samples_dir(job_id):
+        return TRAINING_JOBS_DIR / job_id / "samples" / "positive"
+
+    def synthesize(job_id):
+        generate_positive_samples(training_jobs[job_id].wake_word, num_samples, samples_dir(job_id))
+        clean_samples(job_id, samples_dir(job_id))
+        storage.charge(job_id, "samples/positive")
+        emit_progress(job_id, 50, f"Generated {num_samples} voice samples")
+
+    def featurize(job_id):
+        job = training_jobs[job_id]
+        write_training_instructions(TRAINING_JOBS_DIR / job_id, job.wake_word, config,
+                                    num_samples, samples_dir(job_id), datasets_dir)
+        emit_progress(job_id, 65, "Generating spectrograms from positive samples...")
+        generate_features(samples_dir(job_id), str(samples_dir(job_id)) + "_features",
+                          config.get('feature_format', 'float32'))
+        storage.charge(job_id, "samples/positive_features")
+
+    def train(job_id):
+        model_file = train_model(job_id, training_jobs[job_id].wake_word, config,
+                                 samples_dir(job_id), negative_features)
+        complete_job(job_id, model_file)
+
+    batch.status = "running"
+    try:
+        for job_id in job_ids:
+            (TRAINING_JOBS_DIR / job_id).mkdir(exist_ok=True)
+            emit_progress(job_id, 10, "Initializing batch MicroWakeWord training...", "running")
+
+        # microWakeWord is pre-installed in the Docker image
+        if not MICROWAKEWORD_DIR.exists():
+            raise RuntimeError("microWakeWord directory not found. Please rebuild the Docker image.")
+
+        # Download the shared negatives once while all positives are synthesized in one pool
+        download = ThreadPoolExecutor(max_workers=1)
+        datasets_future = download.submit(download_negative_datasets, batch_dir, datasets_dir, extract=True)
+        for job_id in job_ids:
+            emit_progress(job_id, 30, f"Generating {num_samples} voice samples (pooled with batch)...")
+        job_ids = _run_batch_stage(job_ids, synthesize, BATCH_SYNTHESIS_WORKERS)
+
+        for job_id in job_ids:
+            emit_progress(job_id, 55, "Waiting for shared negative datasets...")
+        try:
+            datasets_future.result()
+        finally:
+            download.shutdown()
+        storage.charge(batch_id, "datasets")
+        negative_features = negative_feature_entries(datasets_dir)
+
+        job_ids = _run_batch_stage(job_ids, featurize, BATCH_SYNTHESIS_WORKERS)
+
+        # Each model trains against the same negative mmaps
+        train_workers = cpu_scheduler_concurrency() if use_cpu_training() else 1
+        job_ids = _run_batch_stage(job_ids, train, train_workers)
+
+    except Exception as e:
+        logger.error(f"Batch {batch_id} failed: {e}")
+        batch.error = str(e)
+        for job_id in batch.job_ids:
+            if training_jobs[job_id].status not in ("completed", "failed"):
+                fail_job(job_id, e)
+
+    finally:
+        statuses = {training_jobs[job_id].status for job_id in batch.job_ids}
+        if statuses == {"completed"}:
+            batch.status = "completed"
+        elif "completed" in statuses:
+            batch.status = "partially_completed"
+        else:
+            batch.status = "failed"
+        batch.completed_at = datetime.now()
+
+        for job_id in batch.job_ids:
+            finish_job_storage(job_id)
+        finish_job_storage(batch_id)
+        emit_batch_progress(batch_id)
 
 
 @app.route('/')
@@ -552,6 +1061,77 @@ def index():
     return render_template('index.html')
 
 
+# On-disk spectrogram format: float32, float16 or uint8 (see compact_features.py)
+DEFAULT_FEATURE_FORMAT = os.environ.get('FEATURE_FORMAT', 'float32')
+
+# Training schedule. Runs stop once average viable recall plateaus and may
+# continue past training_steps, up to max_training_steps, while it improves
+DEFAULT_TRAINING_STEPS = _env_int('TRAINING_STEPS') or 1000
+DEFAULT_EVAL_STEP_INTERVAL = _env_int('EVAL_STEP_INTERVAL') or 500
+DEFAULT_MAX_TRAINING_STEPS = _env_int('MAX_TRAINING_STEPS')
+DEFAULT_EARLY_STOPPING_PATIENCE = int(os.environ.get('EARLY_STOPPING_PATIENCE', 3))
+DEFAULT_EARLY_STOPPING_MIN_DELTA = float(os.environ.get('EARLY_STOPPING_MIN_DELTA', 0.002))
+
+
+def validate_wake_word(wake_word):
+    """Return an error message for an invalid wake word, or None"""
+    if not wake_word:
+        return "Wake word is required"
+
+    if len(wake_word) < 2 or len(wake_word) > 50:
+        return "Wake word must be 2-50 characters"
+
+    return None
+
+
+def build_training_config(data):
+    """Training configuration from request data, with defaults"""
+    return {
+        'num_samples': data.get('num_samples', 2000),
+        'voices': data.get('voices', ['en_US-amy-medium', 'en_US-joe-medium']),
+        'epochs': data.get('epochs', 30),
+        'batch_size': data.get('batch_size', 512),
+        'learning_rate': data.get('learning_rate', 0.001),
+        'probability_cutoff': data.get('probability_cutoff', 0.97),
+        'sliding_window_size': data.get('sliding_window_size', 5),
+        'feature_format': data.get('feature_format', DEFAULT_FEATURE_FORMAT),
+        'training_steps': data.get('training_steps', DEFAULT_TRAINING_STEPS),
+        'eval_step_interval': data.get('eval_step_interval', DEFAULT_EVAL_STEP_INTERVAL),
+        'max_training_steps': data.get('max_training_steps', DEFAULT_MAX_TRAINING_STEPS),
+        'early_stopping_patience': data.get('early_stopping_patience', DEFAULT_EARLY_STOPPING_PATIENCE),
+        'early_stopping_min_delta': data.get('early_stopping_min_delta', DEFAULT_EARLY_STOPPING_MIN_DELTA)
+    }
+
+
+def validate_training_config(config):
+    """Return an error message for invalid training settings, or None"""
+    if config['feature_format'] not in FEATURE_FORMATS:
+        return f"feature_format must be one of {', '.join(FEATURE_FORMATS)}"
+
+    def is_int(value):
+        return isinstance(value, int) and not isinstance(value, bool)
+
+    for key in ('training_steps', 'eval_step_interval'):
+        if not is_int(config[key]) or config[key] < 1:
+            return f"{key} must be a positive integer"
+
+    if config['eval_step_interval'] > config['training_steps']:
+        return "eval_step_interval must not exceed training_steps"
+
+    max_steps = config['max_training_steps']
+    if max_steps is not None and (not is_int(max_steps) or max_steps < config['training_steps']):
+        return "max_training_steps must be an integer of at least training_steps"
+
+    if not is_int(config['early_stopping_patience']) or config['early_stopping_patience'] < 0:
+        return "early_stopping_patience must be a non-negative integer (0 disables early stopping)"
+
+    min_delta = config['early_stopping_min_delta']
+    if isinstance(min_delta, bool) or not isinstance(min_delta, (int, float)) or min_delta < 0:
+        return "early_stopping_min_delta must be a non-negative number"
+
+    return None
+
+
 @app.route('/api/train', methods=['POST'])
 def start_training():
     """Start a new training job"""
@@ -570,24 +1150,41 @@ def start_training():
             return jsonify({"error": "Author name is required"}), 400
 
         # Validate wake word
-        if len(wake_word) < 2 or len(wake_word) > 50:
-            return jsonify({"error": "Wake word must be 2-50 characters"}), 400
+        error = validate_wake_word(wake_word)
+        if error:
+            return jsonify({"error": error}), 400
 
         # Create training configuration
-        config = {
-            'num_samples': data.get('num_samples', 2000),
-            'voices': data.get('voices', ['en_US-amy-medium', 'en_US-joe-medium']),
-            'epochs': data.get('epochs', 30),
-            'batch_size': data.get('batch_size', 512),
-            'learning_rate': data.get('learning_rate', 0.001),
-            'probability_cutoff': data.get('probability_cutoff', 0.97),
-            'sliding_window_size': data.get('sliding_window_size', 5)
-        }
-
-        # Create job
-        job_id = str(uuid.uuid4())
-        job = TrainingJob(job_id, wake_word, method, config, author, website)
-        training_jobs[job_id] = job
+        config = build_training_config(data)
+        error = validate_training_config(config)
+        if error:
+            return jsonify({"error": error}), 400
+
+        force = bool(data.get('force', False))
+
+        with coalesce_lock:
+            # Attach to an identical job instead of running the pipeline twice
+            existing = None if force else find_coalescable_job(job_fingerprint(wake_word, method, config))
+            if existing:
+                existing.coalesced_requests += 1
+                logger.info(f"Coalesced training request into job {existing.job_id}")
+                return jsonify({
+                    "job_id": existing.job_id,
+                    "message": "Attached to identical training job",
+                    "coalesced": True,
+                    "job": existing.to_dict()
+                })
+
+            # Make room for the new job, refusing it if the quota cannot be met
+            try:
+                storage.ensure_capacity()
+            except StorageQuotaExceeded as e:
+                return jsonify({"error": str(e)}), 507
+
+            # Create job
+            job_id = str(uuid.uuid4())
+            job = TrainingJob(job_id, wake_word, method, config, author, website)
+            register_job(job)
         
         # Start training in background
         if method == 'openwakeword':
@@ -607,6 +1204,7 @@ def start_training():
         return jsonify({
             "job_id": job_id,
             "message": "Training started",
+            "coalesced": False,
             "job": job.to_dict()
         })
         
@@ -615,6 +1213,101 @@ def start_training():
         return jsonify({"error": str(e)}), 500
 
 
+@app.route('/api/train/batch', methods=['POST'])
+def start_batch_training():
+    """Start MicroWakeWord training for several wake words sharing one data pipeline"""
+    try:
+        data = request.get_json()
+
+        wake_words = []
+        for wake_word in data.get('wake_words', []):
+            wake_word = str(wake_word).strip().lower()
+            if wake_word not in wake_words:
+                wake_words.append(wake_word)
+        author = data.get('author', '').strip()
+        website = data.get('website', '').strip()
+
+        if not wake_words:
+            return jsonify({"error": "At least one wake word is required"}), 400
+
+        if len(wake_words) > MAX_BATCH_WAKE_WORDS:
+            return jsonify({"error": f"A batch can contain at most {MAX_BATCH_WAKE_WORDS} wake words"}), 400
+
+        if not author:
+            return jsonify({"error": "Author name is required"}), 400
+
+        for wake_word in wake_words:
+            error = validate_wake_word(wake_word)
+            if error:
+                return jsonify({"error": f"{error}: '{wake_word}'"}), 400
+
+        config = build_training_config(data)
+        error = validate_training_config(config)
+        if error:
+            return jsonify({"error": error}), 400
+        force = bool(data.get('force', False))
+
+        with coalesce_lock:
+            # Words identical to in-flight or recent jobs attach to them instead
+            coalesced = {}
+            if not force:
+                for wake_word in wake_words:
+                    existing = find_coalescable_job(
+                        job_fingerprint(wake_word, 'microwakeword', config, negatives=True))
+                    if existing:
+                        existing.coalesced_requests += 1
+                        coalesced[wake_word] = existing.job_id
+            wake_words = [wake_word for wake_word in wake_words if wake_word not in coalesced]
+
+            if not wake_words:
+                return jsonify({
+                    "batch_id": None,
+                    "message": "All wake words attached to identical training jobs",
+                    "coalesced": coalesced
+                })
+
+            # Make room for the new jobs, refusing them if the quota cannot be met
+            try:
+                storage.ensure_capacity()
+            except StorageQuotaExceeded as e:
+                return jsonify({"error": str(e)}), 507
+
+            batch_id = f"batch-{uuid.uuid4()}"
+            job_ids = []
+            for wake_word in wake_words:
+                job_id = str(uuid.uuid4())
+                register_job(TrainingJob(job_id, wake_word, 'microwakeword', config,
+                                         author, website, batch_id=batch_id))
+                job_ids.append(job_id)
+
+            batch = TrainingBatch(batch_id, job_ids, config)
+            training_batches[batch_id] = batch
+
+        thread = threading.Thread(target=train_microwakeword_batch, args=(batch_id,))
+        thread.daemon = True
+        thread.start()
+
+        return jsonify({
+            "batch_id": batch_id,
+            "message": "Batch training started",
+            "coalesced": coalesced,
+            "batch": batch.to_dict()
+        })
+
+    except Exception as e:
+        logger.error(f"Failed to start batch training: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/api/batches/<batch_id>', methods=['GET'])
+def get_batch(batch_id):
+    """Get combined progress for a batch"""
+    batch = training_batches.get(batch_id)
+    if not batch:
+        return jsonify({"error": "Batch not found"}), 404
+    return jsonify(batch.to_dict())
+
+
 @app.route('/api/jobs', methods=['GET'])
 def list_jobs():
     """List all training jobs"""
@@ -643,18 +1336,21 @@ def download_job_files(job_id):
     if not job_dir.exists():
         return jsonify({"error": "Job files not found"}), 404
 
-    # Create ZIP file
-    zip_path = TRAINING_JOBS_DIR / f"{job_id}.zip"
-    shutil.make_archive(
-        str(zip_path.with_suffix('')),
-        'zip',
-        job_dir
-    )
+    storage.touch(job_id)
+
+    # Create ZIP file in a temp location; it is unlinked once opened so
+    # nothing is left behind in the jobs directory
+    fd, zip_path = tempfile.mkstemp(suffix='.zip')
+    os.close(fd)
+    run_blocking(shutil.make_archive, zip_path[:-len('.zip')], 'zip', job_dir)
+    zip_file = open(zip_path, 'rb')
+    os.unlink(zip_path)
 
     return send_file(
-        zip_path,
+        zip_file,
         as_attachment=True,
-        download_name=f"{job.wake_word.replace(' ', '_')}_training.zip"
+        download_name=f"{job.wake_word.replace(' ', '_')}_training.zip",
+        mimetype="application/zip"
     )
 
 
@@ -706,9 +1402,9 @@ def download_model_file(job_id):
     if not json_path:
         return jsonify({"error": "JSON manifest not found in training output"}), 404
 
+    storage.touch(job_id)
+
     # Create a temporary directory for the zip
-    import tempfile
-    import zipfile
 
     with tempfile.TemporaryDirectory() as temp_dir:
         temp_dir_path = Path(temp_dir)
@@ -735,6 +1431,34 @@ def download_model_file(job_id):
     )
 
 
+@app.route('/api/storage', methods=['GET'])
+def get_storage():
+    """Disk usage per job and quota settings"""
+    return jsonify(storage.report())
+
+
+@app.route('/api/storage/gc', methods=['POST'])
+def collect_storage():
+    """Prune intermediates from finished jobs and report the space reclaimed"""
+    data = request.get_json(silent=True) or {}
+    for key in ('target_bytes', 'max_age_hours'):
+        value = data.get(key)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0):
+            return jsonify({"error": f"{key} must be a non-negative number"}), 400
+
+    result = storage.collect(
+        target_bytes=data.get('target_bytes', storage.global_quota),
+        max_age_hours=data.get('max_age_hours'),
+    )
+    return jsonify(result)
+
+
+@app.route('/api/cpu-profile', methods=['GET'])
+def get_cpu_profile():
+    """CPU core allocation and recorded training throughput"""
+    return jsonify({"cpu_training": use_cpu_training(), **cpu_scheduler.report()})
+
+
 @app.route('/api/presets', methods=['GET'])
 def get_presets():
     """Get training presets"""
@@ -783,11 +1507,24 @@ def handle_connect():
     emit('connected', {'message': 'Connected to training server'})
 
 
+@socketio.on('latency_probe')
+def handle_latency_probe(data):
+    """Echo the payload back through the ack so clients can time the round trip"""
+    return data
+
+
 @socketio.on('subscribe')
 def handle_subscribe(data):
-    """Subscribe to job updates"""
+    """Subscribe to job or batch updates; progress is only sent to subscribers"""
+    batch_id = data.get('batch_id')
+    batch = training_batches.get(batch_id)
+    if batch:
+        join_room(batch_id)
+        emit('batch_progress', batch.to_dict())
+
     job_id = data.get('job_id')
     if job_id and job_id in training_jobs:
+        join_room(job_id)
         job = training_jobs[job_id]
         emit('training_progress', {
             'job_id': job_id,
@@ -797,6 +1534,55 @@ def handle_subscribe(data):
         })
 
 
+@socketio.on('disconnect')
+def handle_disconnect():
+    """Clean up per-connection state"""
+    live_tests.stop(request.sid)
+
+
+@socketio.on('live_test_start')
+def handle_live_test_start(data):
+    """Start streaming detection against a trained model"""
+    job = training_jobs.get(data.get('job_id'))
+    if not job or job.status != "completed" or not job.model_path \
+            or Path(job.model_path).suffix != ".tflite" or not Path(job.model_path).exists():
+        emit('live_test_error', {'error': "No trained streaming model for this job"})
+        return
+
+    sid = request.sid
+    try:
+        live_tests.start(
+            sid, job.model_path,
+            job.config.get('probability_cutoff', 0.97),
+            job.config.get('sliding_window_size', 5),
+            on_ready=lambda info: socketio.emit('live_test_started', {'job_id': job.job_id, **info}, to=sid),
+            on_error=lambda error: socketio.emit('live_test_error', {'error': error}, to=sid),
+        )
+    except LiveTestError as e:
+        emit('live_test_error', {'error': str(e)})
+
+
+@socketio.on('live_test_audio')
+def handle_live_test_audio(data):
+    """Queue a chunk of 16 kHz 16-bit mono PCM for the caller's session"""
+    sid = request.sid
+    try:
+        live_tests.submit(
+            sid, data.get('seq'), data.get('sent_at'), bytes(data.get('pcm') or b''),
+            on_result=lambda result: socketio.emit('live_test_result', result, to=sid),
+        )
+    except LiveTestError as e:
+        emit('live_test_error', {'error': str(e)})
+
+
+@socketio.on('live_test_stop')
+def handle_live_test_stop(data=None):
+    """End the caller's live test session"""
+    live_tests.stop(request.sid)
+
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
+    if TRAINING_WORKER_MODE == 'warm':
+        training_worker.start_in_background()
     socketio.run(app, host='0.0.0.0', port=port, debug=True)
@@ -0,0 +1,142 @@
+"""
+Sample Filter
+Cleans synthesized positive samples before featurization: trims leading
+and trailing silence by frame energy, rejects empty or clipped clips and
+drops near-duplicates by comparing compact spectral fingerprints
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+FRAME_MS = 10
+TRIM_BELOW_PEAK_DB = 40.0    # frames this far under the loudest frame count as silence
+SILENCE_FLOOR_DBFS = -60.0   # frames under this level are always silence
+TRIM_PADDING_MS = 50         # silence kept on each side of the speech
+MIN_DURATION_S = 0.2         # shorter (trimmed) clips are rejected as empty
+CLIP_LEVEL = 0.999           # sample magnitude treated as clipped
+MAX_CLIPPED_FRACTION = 0.001
+
+# Fingerprint: log band energies on a fixed band x time grid, floored to
+# ignore noise-only cells, mean-removed and unit-normalized (float16)
+FP_BANDS = 16
+FP_FRAMES = 16
+FP_DYNAMIC_RANGE_DB = 50.0
+DUPLICATE_MIN_SIMILARITY = 0.97  # cosine similarity for a near-duplicate
+DUPLICATE_BLOCK = 1024
+
+
+def frame_levels_db(audio, frame_len):
+    """RMS level of each non-overlapping frame in dBFS"""
+    frames = audio[:len(audio) // frame_len * frame_len].reshape(-1, frame_len)
+    rms = np.sqrt(np.mean(np.square(frames, dtype=np.float64), axis=1))
+    return 20 * np.log10(np.maximum(rms, 1e-10))
+
+
+def trim_silence(audio, sample_rate):
+    """Return audio without leading/trailing silence, or None if nothing is above the floor"""
+    frame_len = sample_rate * FRAME_MS // 1000
+    levels = frame_levels_db(audio, frame_len)
+    if not len(levels):
+        return None
+
+    threshold = max(levels.max() - TRIM_BELOW_PEAK_DB, SILENCE_FLOOR_DBFS)
+    voiced = np.flatnonzero(levels >= threshold)
+    if not len(voiced) or levels.max() < SILENCE_FLOOR_DBFS:
+        return None
+
+    padding = sample_rate * TRIM_PADDING_MS // 1000
+    start = max(voiced[0] * frame_len - padding, 0)
+    end = min((voiced[-1] + 1) * frame_len + padding, len(audio))
+    return audio[start:end]
+
+
+def is_clipped(audio):
+    return np.mean(np.abs(audio) >= CLIP_LEVEL) > MAX_CLIPPED_FRACTION
+
+
+def fingerprint(audio, sample_rate):
+    """Compact spectral fingerprint of a clip (FP_BANDS x FP_FRAMES float16)"""
+    frame_len = sample_rate * FRAME_MS // 1000
+    n_frames = len(audio) // frame_len
+    frames = audio[:n_frames * frame_len].reshape(n_frames, frame_len) * np.hanning(frame_len)
+    power = np.square(np.abs(np.fft.rfft(frames, axis=1)))
+
+    # Pool frequency bins into log-spaced bands and frames onto a fixed grid
+    edges = np.unique(np.geomspace(1, power.shape[1], FP_BANDS + 1).astype(int))
+    bands = np.add.reduceat(power, edges[:-1], axis=1)
+    bands = np.pad(bands, ((0, 0), (0, FP_BANDS - bands.shape[1])))
+    segments = np.linspace(0, n_frames, FP_FRAMES + 1).astype(int)
+    grid = np.stack([bands[a:max(b, a + 1)].mean(axis=0) for a, b in zip(segments[:-1], segments[1:])])
+
+    energy_db = 10 * np.log10(grid + 1e-20)
+    energy_db = np.maximum(energy_db, energy_db.max() - FP_DYNAMIC_RANGE_DB).ravel()
+    energy_db -= energy_db.mean()
+    norm = np.linalg.norm(energy_db)
+    return (energy_db / norm if norm else energy_db).astype(np.float16)
+
+
+def near_duplicates(fingerprints, min_similarity=DUPLICATE_MIN_SIMILARITY):
+    """Indices to drop so no two kept fingerprints are near-duplicates (first one wins)"""
+    if len(fingerprints) < 2:
+        return set()
+
+    vectors = np.stack(fingerprints).astype(np.float32)
+    dropped = set()
+    for block_start in range(0, len(vectors), DUPLICATE_BLOCK):
+        # Cosine similarity of a block of clips against all clips
+        similarity = vectors[block_start:block_start + DUPLICATE_BLOCK] @ vectors.T
+        for row, candidates in enumerate(similarity >= min_similarity):
+            i = block_start + row
+            if i in dropped:
+                continue
+            later = np.flatnonzero(candidates)
+            dropped.update(int(j) for j in later[later > i])
+    return dropped
+
+
+def filter_samples(samples_dir, pattern="*.wav"):
+    """
+    Trim, validate and de-duplicate the clips in samples_dir in place.
+
+    Rejected clips are deleted; kept clips are rewritten trimmed.
+    Returns counts for reporting.
+    """
+    import soundfile as sf
+
+    paths = sorted(Path(samples_dir).glob(pattern))
+    report = {"total": len(paths), "kept": 0, "empty": 0, "clipped": 0,
+              "duplicates": 0, "trimmed_seconds": 0.0}
+
+    # Only fingerprints are kept in memory; trimmed clips are written as we go
+    kept_paths, fingerprints = [], []
+    for path in paths:
+        audio, sample_rate = sf.read(path, dtype='float32', always_2d=False)
+        if audio.ndim > 1:
+            audio = audio.mean(axis=1)
+
+        if is_clipped(audio):
+            report["clipped"] += 1
+            path.unlink()
+            continue
+
+        trimmed = trim_silence(audio, sample_rate)
+        if trimmed is None or len(trimmed) < MIN_DURATION_S * sample_rate:
+            report["empty"] += 1
+            path.unlink()
+            continue
+
+        if len(trimmed) < len(audio):
+            report["trimmed_seconds"] += (len(audio) - len(trimmed)) / sample_rate
+            sf.write(path, trimmed, sample_rate, subtype='PCM_16')
+        kept_paths.append(path)
+        fingerprints.append(fingerprint(trimmed, sample_rate))
+
+    duplicates = near_duplicates(fingerprints)
+    for i in duplicates:
+        kept_paths[i].unlink()
+
+    report["duplicates"] = len(duplicates)
+    report["kept"] = len(kept_paths) - len(duplicates)
+    report["trimmed_seconds"] = round(report["trimmed_seconds"], 2)
+    return report
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Production Server
+Serves the app from eventlet's cooperative WSGI server without the Werkzeug
+debugger or reloader. Request handlers, Socket.IO connections and training
+pipeline threads run as green threads; heavy filesystem and CPU work is
+handed to a bounded OS thread pool (see blocking.py).
+
+Usage:
+    python app/serve.py
+"""
+
+import eventlet
+
+from blocking import preimport
+
+# Libraries used on the blocking-work pool must create their locks unpatched
+preimport()
+
+# Must happen before anything else imports socket, threading or subprocess
+eventlet.monkey_patch()
+
+import os  # noqa: E402
+import logging  # noqa: E402
+
+from main import app, socketio, training_worker, TRAINING_WORKER_MODE  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    port = int(os.environ.get('PORT', 5000))
+    if TRAINING_WORKER_MODE == 'warm':
+        training_worker.start_in_background()
+
+    logger.info(f"Serving on port {port} ({socketio.async_mode})")
+    socketio.run(app, host='0.0.0.0', port=port, debug=False, use_reloader=False,
+                 log_output=os.environ.get('ACCESS_LOG', '0') == '1')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,283 @@
+"""
+Storage Manager
+Tracks per-job disk usage under training_jobs, enforces quotas and
+reclaims space from finished jobs by pruning reproducible intermediates
+"""
+
+import os
+import re
+import shutil
+import threading
+import time
+import logging
+from pathlib import Path
+
+from blocking import run_blocking
+
+logger = logging.getLogger(__name__)
+
+# Stage outputs tracked as separate usage entries (relative to the job dir)
+TRACKED_PATHS = (
+    "samples/positive",
+    "samples/positive_features",
+    "datasets",
+    "trained_models",
+)
+
+# Intermediates that can be regenerated from the job configuration
+REPRODUCIBLE_PATHS = (
+    "samples/positive_features",
+    "datasets",
+)
+
+# Final model file kept when pruning trained_models (its JSON manifest sits beside it)
+FINAL_MODEL_NAME = "stream_state_internal_quant.tflite"
+
+# Archives left next to job dirs by older versions of the download endpoint
+STRAY_ARCHIVE_RE = re.compile(r"^[0-9a-f\-]{36}\.zip$")
+
+
+class StorageQuotaExceeded(RuntimeError):
+    """Raised when a job or the jobs directory goes over its disk quota"""
+
+
+def _key_for(rel_path):
+    """Map a path relative to the job dir onto its usage entry"""
+    for tracked in sorted(TRACKED_PATHS, key=len, reverse=True):
+        if rel_path == tracked or rel_path.startswith(tracked + "/"):
+            return tracked
+    return rel_path.split("/", 1)[0] if rel_path else "."
+
+
+class StorageManager:
+    """Per-job disk accounting and garbage collection for training_jobs"""
+
+    def __init__(self, jobs_dir, global_quota=None, job_quota=None,
+                 max_age_hours=None, is_active=None):
+        self.jobs_dir = Path(jobs_dir)
+        self.global_quota = global_quota or None
+        self.job_quota = job_quota or None
+        self.max_age_hours = max_age_hours or None
+        self.is_active = is_active or (lambda job_id: False)
+        self.last_gc = None
+        self._usage = {}        # job_id -> {usage entry: bytes}
+        self._last_access = {}  # job_id -> epoch seconds
+        self._scanned = False
+        self._lock = threading.RLock()    # guards _usage/_last_access; held only briefly
+        self._gc_lock = threading.RLock()  # serializes collections, held while deleting
+
+    # ------------------------------------------------------------------
+    # Accounting
+    # ------------------------------------------------------------------
+
+    def _job_dirs(self):
+        for path in self.jobs_dir.iterdir():
+            if path.is_dir() and not path.name.startswith(('.', '_')):
+                yield path
+
+    def _measure(self, job_dir, rel=""):
+        """Walk job_dir/rel once and bucket file sizes by usage entry"""
+        usage = {}
+        start = job_dir / rel if rel else job_dir
+        if not start.exists():
+            return usage
+        if start.is_file():
+            return {_key_for(rel): start.stat().st_size}
+        for root, _dirs, files in os.walk(start):
+            rel_root = Path(root).relative_to(job_dir).as_posix()
+            for name in files:
+                file_rel = name if rel_root == "." else f"{rel_root}/{name}"
+                try:
+                    size = os.lstat(os.path.join(root, name)).st_size
+                except OSError:
+                    continue
+                key = _key_for(file_rel)
+                usage[key] = usage.get(key, 0) + size
+        return usage
+
+    def _ensure_scanned(self):
+        if self._scanned:
+            return
+        with self._gc_lock:
+            if self._scanned:
+                return
+            for job_dir in self._job_dirs():
+                measured = run_blocking(self._measure, job_dir)
+                with self._lock:
+                    self._usage.setdefault(job_dir.name, measured)
+            self._scanned = True
+
+    def record(self, job_id, rel_path=""):
+        """Re-measure one stage output (or the whole job) after it changed"""
+        self._ensure_scanned()
+        rel = Path(rel_path).as_posix().strip("/") if rel_path else ""
+        rel = "" if rel == "." else rel
+        owner = _key_for(rel) if rel else ""
+        if owner and rel.startswith(owner + "/"):
+            rel = owner
+        measured = run_blocking(self._measure, self.jobs_dir / job_id, rel)
+        with self._lock:
+            usage = self._usage.setdefault(job_id, {})
+            for key in list(usage):
+                if not rel or key == rel or key.startswith(rel + "/"):
+                    del usage[key]
+            usage.update(measured)
+        return self.job_usage(job_id)
+
+    def touch(self, job_id):
+        """Mark a job as recently used for the LRU policy"""
+        with self._lock:
+            self._last_access[job_id] = time.time()
+
+    def job_usage(self, job_id):
+        self._ensure_scanned()
+        with self._lock:
+            return sum(self._usage.get(job_id, {}).values())
+
+    def total_usage(self):
+        self._ensure_scanned()
+        with self._lock:
+            return sum(sum(usage.values()) for usage in self._usage.values())
+
+    def report(self):
+        """Usage summary for the API"""
+        self._ensure_scanned()
+        with self._lock:
+            jobs = {job_id: {"total_bytes": sum(usage.values()), "breakdown": dict(usage)}
+                    for job_id, usage in self._usage.items()}
+        return {
+            "total_bytes": sum(job["total_bytes"] for job in jobs.values()),
+            "quota_bytes": self.global_quota,
+            "job_quota_bytes": self.job_quota,
+            "max_age_hours": self.max_age_hours,
+            "jobs": jobs,
+            "last_gc": self.last_gc,
+        }
+
+    # ------------------------------------------------------------------
+    # Quotas
+    # ------------------------------------------------------------------
+
+    def charge(self, job_id, rel_path=""):
+        """Record a stage output and enforce the per-job and global quotas"""
+        used = self.record(job_id, rel_path)
+        if self.job_quota and used > self.job_quota:
+            raise StorageQuotaExceeded(
+                f"Job uses {used} bytes, over the per-job quota of {self.job_quota} bytes")
+        self.ensure_capacity(exclude=(job_id,))
+
+    def ensure_capacity(self, exclude=()):
+        """Collect garbage if over the global quota, raise if that is not enough"""
+        if not self.global_quota or self.total_usage() <= self.global_quota:
+            return
+        self.collect(target_bytes=self.global_quota, exclude=exclude)
+        total = self.total_usage()
+        if total > self.global_quota:
+            raise StorageQuotaExceeded(
+                f"Training jobs use {total} bytes, over the storage quota of {self.global_quota} bytes")
+
+    # ------------------------------------------------------------------
+    # Garbage collection
+    # ------------------------------------------------------------------
+
+    def _last_used(self, job_id):
+        with self._lock:
+            if job_id in self._last_access:
+                return self._last_access[job_id]
+        try:
+            return (self.jobs_dir / job_id).stat().st_mtime
+        except OSError:
+            return 0
+
+    def _prunable_paths(self, job_id):
+        """Reproducible intermediates of a job; the final tflite and manifest are kept"""
+        job_dir = self.jobs_dir / job_id
+        paths = [job_dir / rel for rel in REPRODUCIBLE_PATHS if (job_dir / rel).exists()]
+
+        trained_dir = job_dir / "trained_models"
+        if trained_dir.exists():
+            for root, _dirs, files in os.walk(trained_dir):
+                keep_manifest = FINAL_MODEL_NAME in files
+                for name in files:
+                    if name == FINAL_MODEL_NAME or (keep_manifest and name.endswith(".json")):
+                        continue
+                    paths.append(Path(root) / name)
+        return paths
+
+    def prune_job(self, job_id):
+        """Delete a finished job's intermediates and return the bytes reclaimed"""
+        before = self.job_usage(job_id)
+        for path in self._prunable_paths(job_id):
+            try:
+                if path.is_dir():
+                    run_blocking(shutil.rmtree, path)
+                else:
+                    path.unlink()
+            except OSError as e:
+                logger.warning(f"Could not remove {path}: {e}")
+
+        # Drop directories emptied by pruning checkpoints
+        trained_dir = self.jobs_dir / job_id / "trained_models"
+        if trained_dir.exists():
+            for root, _dirs, _files in os.walk(trained_dir, topdown=False):
+                try:
+                    if root != str(trained_dir) and not os.listdir(root):
+                        os.rmdir(root)
+                except OSError:
+                    pass
+
+        reclaimed = before - self.record(job_id)
+        if reclaimed:
+            logger.info(f"Pruned job {job_id}: reclaimed {reclaimed} bytes")
+        return reclaimed
+
+    def _remove_stray_archives(self):
+        reclaimed = 0
+        for path in self.jobs_dir.iterdir():
+            if path.is_file() and STRAY_ARCHIVE_RE.match(path.name):
+                try:
+                    size = path.stat().st_size
+                    path.unlink()
+                except OSError:
+                    continue
+                reclaimed += size
+        return reclaimed
+
+    def collect(self, target_bytes=None, max_age_hours=None, exclude=()):
+        """
+        Prune finished jobs, least recently used first.
+
+        Jobs idle for longer than max_age_hours are always pruned; others are
+        pruned only until total usage drops to target_bytes. Collections are
+        serialized so two callers never prune the same job at once; usage
+        reads do not wait for them.
+        """
+        self._ensure_scanned()
+        max_age_hours = max_age_hours if max_age_hours is not None else self.max_age_hours
+
+        with self._gc_lock:
+            now = time.time()
+            with self._lock:
+                job_ids = list(self._usage)
+            candidates = [job_id for job_id in job_ids
+                          if job_id not in exclude and not self.is_active(job_id)]
+            candidates.sort(key=self._last_used)
+
+            pruned = []
+            reclaimed = self._remove_stray_archives()
+            for job_id in candidates:
+                expired = max_age_hours and now - self._last_used(job_id) > max_age_hours * 3600
+                over_target = target_bytes is not None and self.total_usage() > target_bytes
+                if not (expired or over_target):
+                    continue
+                freed = self.prune_job(job_id)
+                if freed:
+                    pruned.append({"job_id": job_id, "bytes_reclaimed": freed})
+                    reclaimed += freed
+
+            self.last_gc = {
+                "at": now,
+                "bytes_reclaimed": reclaimed,
+                "jobs": pruned,
+            }
+            return self.last_gc
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Training Worker
+Long-lived fork server that imports TensorFlow and microWakeWord once and
+forks a fresh child per training run, so jobs skip the import cost while
+each run still gets its own process state
+"""
+
+import os
+import sys
+import time
+import runpy
+import signal
+import logging
+import threading
+import traceback
+import subprocess
+import warnings
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener, Client
+
+logger = logging.getLogger(__name__)
+
+TRAINING_MODULE = "microwakeword.model_train_eval"
+SOCKET_PATH = os.environ.get('TRAINING_WORKER_SOCKET', '/tmp/wake-word-training-worker.sock')
+STARTUP_TIMEOUT = 120  # seconds allowed for the worker to import TensorFlow
+AUTHKEY_ENV = "TRAINING_WORKER_AUTHKEY"  # hex key handed to the worker at spawn
+
+# Files written into the run's working directory
+STDOUT_LOG = "training_stdout.log"
+STDERR_LOG = "training_stderr.log"
+EXIT_CODE_FILE = ".training_exit_code"
+
+
+class WorkerUnavailable(RuntimeError):
+    """Raised when the warm worker cannot be started or reached"""
+
+
+# ----------------------------------------------------------------------
+# Server side (runs in the worker process)
+# ----------------------------------------------------------------------
+
+def preload():
+    """Import the heavy training libraries without touching any devices"""
+    import tensorflow  # noqa: F401
+    import importlib
+    importlib.import_module(TRAINING_MODULE)
+
+    from compact_features import install_reader
+    install_reader()
+
+
+def run_module(args):
+    """Run the training module in this process and return its exit code"""
+    try:
+        sys.argv = [TRAINING_MODULE] + list(args)
+        with warnings.catch_warnings():
+            # In the warm worker the module is already in sys.modules from preload()
+            warnings.simplefilter("ignore", RuntimeWarning)
+            runpy.run_module(TRAINING_MODULE, run_name="__main__", alter_sys=True)
+        return 0
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+
+
+def _run_child(request):
+    """Body of a forked child: run one training and exit with its status"""
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    cwd = request["cwd"]
+    os.chdir(cwd)
+    os.environ.clear()
+    os.environ.update(request["env"])
+    if request.get("cpu_affinity"):
+        os.sched_setaffinity(0, request["cpu_affinity"])
+
+    for fd, name in ((1, STDOUT_LOG), (2, STDERR_LOG)):
+        log_fd = os.open(os.path.join(cwd, name), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        os.dup2(log_fd, fd)
+        os.close(log_fd)
+
+    code = 1
+    try:
+        code = run_module(request["args"])
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.flush()
+            except (OSError, ValueError):
+                pass
+        # Write then rename so the client never reads a partial status
+        exit_file = os.path.join(cwd, EXIT_CODE_FILE)
+        with open(exit_file + ".tmp", 'w') as f:
+            f.write(str(code))
+        os.replace(exit_file + ".tmp", exit_file)
+        os._exit(code)
+
+
+def _watch_parent(parent_pid):
+    """Exit when the web app that started us goes away"""
+    while os.getppid() == parent_pid:
+        time.sleep(5)
+    os._exit(0)
+
+
+def serve(socket_path=SOCKET_PATH):
+    """Accept training requests forever, forking one child per request"""
+    # Only the web app that spawned us knows the key; keep it out of the children
+    authkey = bytes.fromhex(os.environ.pop(AUTHKEY_ENV))
+    preload()
+
+    # Children are reaped automatically; clients poll their pid instead
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    threading.Thread(target=_watch_parent, args=(os.getppid(),), daemon=True).start()
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    listener = Listener(socket_path, family='AF_UNIX', authkey=authkey)
+    print(f"Training worker ready on {socket_path}", flush=True)
+
+    while True:
+        try:
+            conn = listener.accept()
+            request = conn.recv()
+        except (EOFError, OSError, AuthenticationError):
+            continue
+
+        pid = os.fork()
+        if pid == 0:
+            conn.close()
+            _run_child(request)
+
+        try:
+            conn.send({"pid": pid})
+        finally:
+            conn.close()
+
+
+# ----------------------------------------------------------------------
+# Client side (runs in the web app)
+# ----------------------------------------------------------------------
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class TrainingWorker:
+    """Starts the fork server on demand and submits training runs to it"""
+
+    def __init__(self, socket_path=SOCKET_PATH):
+        self.socket_path = socket_path
+        self.authkey = os.urandom(32)  # new for every app start
+        self._proc = None
+        self._lock = threading.Lock()
+
+    def ensure_started(self):
+        with self._lock:
+            if self._proc and self._proc.poll() is None and os.path.exists(self.socket_path):
+                return
+
+            if not self._proc or self._proc.poll() is not None:
+                # A socket left by an earlier container or app run would look
+                # ready before the new worker has finished importing TensorFlow
+                if os.path.exists(self.socket_path):
+                    os.unlink(self.socket_path)
+                logger.info("Starting warm training worker")
+                self._proc = subprocess.Popen(
+                    [sys.executable, os.path.abspath(__file__), "serve", self.socket_path],
+                    env={**os.environ, AUTHKEY_ENV: self.authkey.hex()}
+                )
+
+            deadline = time.time() + STARTUP_TIMEOUT
+            while not os.path.exists(self.socket_path):
+                if self._proc.poll() is not None:
+                    raise WorkerUnavailable(
+                        f"Training worker exited during startup (code {self._proc.returncode})")
+                if time.time() > deadline:
+                    raise WorkerUnavailable("Training worker did not start in time")
+                time.sleep(0.5)
+
+    def start_in_background(self):
+        """Pre-import the training libraries before the first job arrives"""
+        def start():
+            try:
+                self.ensure_started()
+            except WorkerUnavailable as e:
+                logger.warning(f"Warm training worker unavailable: {e}")
+
+        threading.Thread(target=start, daemon=True).start()
+
+    def run(self, args, cwd, env, timeout=None, cpu_affinity=None, should_stop=None):
+        """
+        Run one training in a forked child; mirrors subprocess.run's result.
+
+        should_stop is polled while the run is in progress; when it returns
+        True the child is killed and the result has a negative return code.
+        """
+        self.ensure_started()
+
+        cwd = str(cwd)
+        exit_file = os.path.join(cwd, EXIT_CODE_FILE)
+        _clear_outputs(cwd)
+
+        try:
+            conn = Client(self.socket_path, family='AF_UNIX', authkey=self.authkey)
+            conn.send({
+                "args": list(args),
+                "cwd": cwd,
+                "env": dict(env),
+                "cpu_affinity": list(cpu_affinity) if cpu_affinity else None,
+            })
+            pid = conn.recv()["pid"]
+            conn.close()
+        except (OSError, EOFError, AuthenticationError) as e:
+            raise WorkerUnavailable(f"Could not reach training worker: {e}")
+
+        deadline = time.time() + timeout if timeout else None
+        try:
+            while not os.path.exists(exit_file):
+                if not _pid_alive(pid):
+                    # Killed before it could record a status
+                    if not os.path.exists(exit_file):
+                        returncode = -1
+                        break
+                if deadline and time.time() > deadline:
+                    raise subprocess.TimeoutExpired([TRAINING_MODULE] + list(args), timeout)
+                if should_stop and should_stop():
+                    _kill(pid)
+                    returncode = -signal.SIGKILL
+                    break
+                time.sleep(0.2)
+            else:
+                with open(exit_file) as f:
+                    returncode = int(f.read().strip())
+        except BaseException:
+            # Never leave a run going on cores the caller is about to release
+            _kill(pid)
+            raise
+
+        return _completed(args, cwd, returncode)
+
+
+def run_cold(args, cwd, env, timeout=None, cpu_affinity=None, should_stop=None):
+    """One training in a fresh process, with the same logs and stop hook as the warm worker"""
+    cwd = str(cwd)
+    _clear_outputs(cwd)
+    preexec_fn = (lambda: os.sched_setaffinity(0, cpu_affinity)) if cpu_affinity else None
+
+    with open(os.path.join(cwd, STDOUT_LOG), 'w') as stdout, \
+            open(os.path.join(cwd, STDERR_LOG), 'w') as stderr:
+        proc = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "run"] + list(args),
+            cwd=cwd, env=env, stdout=stdout, stderr=stderr, preexec_fn=preexec_fn
+        )
+
+    deadline = time.time() + timeout if timeout else None
+    try:
+        while proc.poll() is None:
+            if deadline and time.time() > deadline:
+                raise subprocess.TimeoutExpired([TRAINING_MODULE] + list(args), timeout)
+            if should_stop and should_stop():
+                proc.kill()
+                break
+            time.sleep(0.2)
+    except BaseException:
+        # Never leave a run going on cores the caller is about to release
+        proc.kill()
+        proc.wait()
+        raise
+
+    return _completed(args, cwd, proc.wait())
+
+
+def _kill(pid):
+    try:
+        os.kill(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def _clear_outputs(cwd):
+    """Remove a previous run's logs and status so they are not mistaken for this run's"""
+    for name in (EXIT_CODE_FILE, STDOUT_LOG, STDERR_LOG):
+        path = os.path.join(cwd, name)
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+def _completed(args, cwd, returncode):
+    return subprocess.CompletedProcess(
+        [TRAINING_MODULE] + list(args),
+        returncode,
+        _read_log(cwd, STDOUT_LOG),
+        _read_log(cwd, STDERR_LOG),
+    )
+
+
+def _read_log(cwd, name):
+    path = os.path.join(cwd, name)
+    if not os.path.exists(path):
+        return ""
+    with open(path, errors='replace') as f:
+        return f.read()
+
+
+if __name__ == '__main__':
+    # training_worker.py serve [socket]  - run the fork server
+    # training_worker.py run <args...>   - one cold training run in this process
+    if len(sys.argv) > 1 and sys.argv[1] == "run":
+        from compact_features import install_reader
+        install_reader()
+        sys.exit(run_module(sys.argv[2:]))
+    serve(sys.argv[2] if len(sys.argv) > 2 else SOCKET_PATH)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Feature Format Benchmark
+Compares the float32, float16 and uint8 feature formats on disk footprint,
+random-batch read throughput (the training loop's access pattern, on a
+warm page cache) and reconstruction error.
+
+It does not measure training throughput or model accuracy: no end-to-end
+training comparison between formats has been run. --compare-jobs only
+reports the best recall logged by two jobs you trained yourself.
+
+Usage:
+    # Re-encode an existing float32 feature mmap
+    python benchmarks/feature_format_benchmark.py \\
+        --features training_jobs/<job_id>/samples/positive_features/training/wakeword_mmap
+
+    # Or synthetic spectrograms shaped like microfrontend output
+    python benchmarks/feature_format_benchmark.py --synthetic 5000
+
+    # Compare model accuracy of two finished jobs trained with different formats
+    python benchmarks/feature_format_benchmark.py --synthetic 1000 \\
+        --compare-jobs training_jobs/<float32_job> training_jobs/<uint8_job>
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+from compact_features import FORMATS, open_features, write_features  # noqa: E402
+from early_stopping import RECALL_RE  # noqa: E402
+
+
+def synthetic_spectrograms(count, seed=0):
+    """Spectrograms in the microfrontend's value range (roughly 0-26) with ragged lengths"""
+    rng = np.random.default_rng(seed)
+    for _ in range(count):
+        frames = int(rng.integers(100, 200))
+        base = rng.uniform(0, 10, size=(1, 40))
+        yield (base + rng.gamma(2.0, 2.0, size=(frames, 40))).clip(0, 26).astype(np.float32)
+
+
+def directory_bytes(path):
+    return sum(f.stat().st_size for f in Path(path).rglob('*') if f.is_file())
+
+
+def read_throughput(features, batch_size, batches, seed=0):
+    """Random-index batches per second, including dequantization"""
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+    for _ in range(batches):
+        indices = rng.integers(0, len(features), size=batch_size)
+        batch = features[indices]
+        sum(float(spectrogram[0, 0]) for spectrogram in batch)
+    elapsed = time.perf_counter() - start
+    return batches * batch_size / elapsed
+
+
+def reconstruction_error(reference, features):
+    abs_errors, signal, noise = [], 0.0, 0.0
+    for original, decoded in zip(reference, features):
+        diff = decoded - original
+        abs_errors.append(float(np.abs(diff).max()))
+        signal += float(np.square(original).sum())
+        noise += float(np.square(diff).sum())
+    snr = float('inf') if noise == 0 else 10 * np.log10(signal / noise)
+    return max(abs_errors), snr
+
+
+def best_recall(job_dir):
+    """Best average viable recall from a finished job's training log"""
+    best = None
+    for name in ("training_stdout.log", "training_stderr.log"):
+        log = Path(job_dir) / name
+        if log.exists():
+            for match in RECALL_RE.finditer(log.read_text(errors='replace')):
+                recall = float(match.group(2))
+                best = recall if best is None else max(best, recall)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--features', help="Existing float32 RaggedMmap directory")
+    source.add_argument('--synthetic', type=int, help="Number of synthetic spectrograms")
+    parser.add_argument('--batch-size', type=int, default=128)
+    parser.add_argument('--batches', type=int, default=200)
+    parser.add_argument('--compare-jobs', nargs='+', metavar='JOB_DIR',
+                        help="Finished job directories to compare by best average viable recall")
+    args = parser.parse_args()
+
+    if args.features:
+        reference = [np.asarray(x, dtype=np.float32) for x in open_features(args.features)]
+    else:
+        reference = list(synthetic_spectrograms(args.synthetic))
+
+    print(f"{len(reference)} spectrograms, batch size {args.batch_size}\n")
+    print(f"{'format':<8} {'disk MB':>10} {'ratio':>7} {'samples/s':>12} {'max abs err':>12} {'SNR dB':>8}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline = None
+        for fmt in FORMATS:
+            out_dir = Path(tmp) / f"{fmt}_mmap"
+            write_features(out_dir, iter(reference), fmt=fmt)
+            size = directory_bytes(out_dir)
+            baseline = baseline or size
+
+            features = open_features(out_dir)
+            throughput = read_throughput(features, args.batch_size, args.batches)
+            max_err, snr = reconstruction_error(reference, features)
+
+            print(f"{fmt:<8} {size / 1e6:>10.2f} {size / baseline:>7.2f} {throughput:>12.0f} "
+                  f"{max_err:>12.4f} {snr:>8.1f}")
+
+    if args.compare_jobs:
+        print("\nModel accuracy (best average viable recall during training):")
+        for job_dir in args.compare_jobs:
+            recall = best_recall(job_dir)
+            print(f"  {job_dir}: {'n/a' if recall is None else f'{recall:.4f}'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Serving Load Test
+Connects a growing number of Socket.IO clients to a running server and, at
+each level, measures /api/jobs latency, Socket.IO round trips (the
+latency_probe ack) and training_progress delivery delay. Each client
+subscribes to one of the running jobs, spread round-robin, as a browser
+watching a job does. Run it against app/serve.py while jobs are training:
+with blocking work off the event loop, latency should stay flat as
+clients are added.
+
+Requires: pip install "python-socketio[asyncio_client]" aiohttp
+
+Usage:
+    python benchmarks/serving_load_test.py --url http://localhost:5000 \\
+        --clients 50 100 200 400 --duration 30
+"""
+
+import argparse
+import asyncio
+import time
+
+import aiohttp
+import socketio
+
+CONNECT_BATCH = 50  # clients connected concurrently while ramping up
+
+
+def percentiles(samples, points=(50, 95, 99)):
+    if not samples:
+        return ["-"] * len(points)
+    ordered = sorted(samples)
+    return [f"{ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]:.1f}" for p in points]
+
+
+class LoadTest:
+    def __init__(self, url, pollers, probers, interval):
+        self.url = url.rstrip('/')
+        self.pollers = pollers
+        self.probers = probers
+        self.interval = interval
+        self.clients = []
+        self.job_ids = []
+        self.reset()
+
+    def reset(self):
+        self.http_ms = []
+        self.probe_ms = []
+        self.progress_ms = []
+        self.errors = 0
+        self.running_jobs = 0
+
+    async def load_jobs(self):
+        """Running job ids the clients subscribe to"""
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"{self.url}/api/jobs") as response:
+                data = await response.json()
+        self.job_ids = [job['job_id'] for job in data['jobs'] if job['status'] == 'running']
+
+    async def connect(self, count):
+        async def connect_one(job_id):
+            client = socketio.AsyncClient(reconnection=False)
+
+            @client.on('training_progress')
+            async def on_progress(data):
+                if 'sent_at' in data:
+                    self.progress_ms.append((time.time() - data['sent_at']) * 1000)
+
+            await client.connect(self.url, transports=['websocket'])
+            if job_id:
+                await client.emit('subscribe', {'job_id': job_id})
+            return client
+
+        while len(self.clients) < count:
+            batch = min(CONNECT_BATCH, count - len(self.clients))
+            job_ids = [self.job_ids[(len(self.clients) + i) % len(self.job_ids)] if self.job_ids else None
+                       for i in range(batch)]
+            results = await asyncio.gather(*(connect_one(job_id) for job_id in job_ids), return_exceptions=True)
+            connected = [client for client in results if not isinstance(client, Exception)]
+            if not connected:
+                raise RuntimeError(f"Could not connect clients: {results[0]}")
+            self.clients.extend(connected)
+
+    async def poll_jobs(self, session, stop):
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                async with session.get(f"{self.url}/api/jobs") as response:
+                    data = await response.json()
+                self.http_ms.append((time.perf_counter() - start) * 1000)
+                self.running_jobs = sum(job['status'] == 'running' for job in data['jobs'])
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                self.errors += 1
+            await asyncio.sleep(self.interval)
+
+    async def probe(self, offset, stop):
+        sent = offset
+        while not stop.is_set():
+            client = self.clients[sent % len(self.clients)]
+            start = time.perf_counter()
+            try:
+                await client.call('latency_probe', {'n': sent}, timeout=10)
+                self.probe_ms.append((time.perf_counter() - start) * 1000)
+            except socketio.exceptions.SocketIOError:
+                self.errors += 1
+            sent += self.probers
+            await asyncio.sleep(self.interval)
+
+    async def measure(self, duration):
+        self.reset()
+        stop = asyncio.Event()
+        timeout = aiohttp.ClientTimeout(total=30)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            tasks = [asyncio.create_task(self.poll_jobs(session, stop)) for _ in range(self.pollers)]
+            tasks += [asyncio.create_task(self.probe(i, stop)) for i in range(self.probers)]
+            await asyncio.sleep(duration)
+            stop.set()
+            await asyncio.gather(*tasks)
+
+    async def close(self):
+        await asyncio.gather(*(client.disconnect() for client in self.clients), return_exceptions=True)
+
+
+async def run(args):
+    test = LoadTest(args.url, args.pollers, args.probers, args.interval)
+    print(f"{'clients':>8} {'running':>8} {'/api/jobs p50/p95/p99 ms':>26} "
+          f"{'probe p50/p95/p99 ms':>22} {'progress p50/p95 ms':>20} {'events':>7} {'errors':>7}")
+    try:
+        await test.load_jobs()
+        for level in args.clients:
+            await test.connect(level)
+            await test.measure(args.duration)
+            http = "/".join(percentiles(test.http_ms))
+            probe = "/".join(percentiles(test.probe_ms))
+            progress = "/".join(percentiles(test.progress_ms, (50, 95)))
+            print(f"{len(test.clients):>8} {test.running_jobs:>8} {http:>26} {probe:>22} "
+                  f"{progress:>20} {len(test.progress_ms):>7} {test.errors:>7}")
+    finally:
+        await test.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--clients', type=int, nargs='+', default=[50, 100, 200, 400],
+                        help="Connected client counts to measure at, in order")
+    parser.add_argument('--duration', type=float, default=30, help="Seconds measured per level")
+    parser.add_argument('--pollers', type=int, default=10, help="Concurrent /api/jobs pollers")
+    parser.add_argument('--probers', type=int, default=10, help="Concurrent Socket.IO latency probes")
+    parser.add_argument('--interval', type=float, default=0.1, help="Pause between requests per poller/prober")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
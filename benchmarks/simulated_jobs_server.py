@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Simulated Jobs Server
+Serves the app like app/serve.py, with a number of fake "running" jobs
+that repeat the pipeline's blocking work (sample filtering, feature
+writing, job zips) and emit training_progress events. Lets
+serving_load_test.py measure latency "while jobs are running" on machines
+without piper, TensorFlow or the feature generator.
+
+Usage:
+    python benchmarks/simulated_jobs_server.py --jobs 4 --port 5000
+    python benchmarks/simulated_jobs_server.py --jobs 4 --inline  # work on the event loop
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+import eventlet  # noqa: E402
+
+from blocking import preimport  # noqa: E402
+
+preimport()
+eventlet.monkey_patch()
+
+import argparse  # noqa: E402
+import shutil  # noqa: E402
+import tempfile  # noqa: E402
+
+import numpy as np  # noqa: E402
+import soundfile as sf  # noqa: E402
+
+import main as web  # noqa: E402
+from blocking import run_blocking  # noqa: E402
+from compact_features import write_features  # noqa: E402
+from sample_filter import filter_samples  # noqa: E402
+
+
+def make_samples(count, seed=0):
+    """1.5 s clips with a second of tone-modulated noise, like trimmed TTS output"""
+    rng = np.random.default_rng(seed)
+    samples_dir = Path(tempfile.mkdtemp())
+    for i in range(count):
+        audio = np.zeros(24000, dtype=np.float32)
+        audio[6000:18000] = rng.normal(0, 0.1, 12000) * np.sin(np.linspace(0, 40 * (i + 1), 12000))
+        sf.write(samples_dir / f"{i}.wav", audio, 16000, subtype='PCM_16')
+    return samples_dir
+
+
+def simulated_job(job_id, samples, spectrograms, run):
+    job_dir = web.TRAINING_JOBS_DIR / job_id
+    step = 0
+    while True:
+        step += 1
+        shutil.rmtree(job_dir / "samples", ignore_errors=True)
+        shutil.copytree(samples, job_dir / "samples" / "positive")
+        web.emit_progress(job_id, step % 100, f"Pass {step}: filtering samples")
+        run(filter_samples, job_dir / "samples" / "positive")
+
+        features_dir = job_dir / "samples" / "positive_features" / "training"
+        features_dir.mkdir(parents=True)
+        run(write_features, features_dir / "wakeword_mmap", iter(spectrograms), "uint8")
+        web.emit_progress(job_id, step % 100, f"Pass {step}: zipping job")
+        run(shutil.make_archive, str(job_dir / "bundle"), 'zip', job_dir / "samples")
+        eventlet.sleep(0.05)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=4)
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--samples', type=int, default=150, help="Clips filtered per pass")
+    parser.add_argument('--spectrograms', type=int, default=3000, help="Spectrograms packed per pass")
+    parser.add_argument('--inline', action='store_true',
+                        help="Run the blocking work on the event loop instead of the thread pool")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    samples = make_samples(args.samples)
+    spectrograms = [rng.uniform(0, 26, (150, 40)).astype(np.float32) for _ in range(args.spectrograms)]
+    run = (lambda fn, *a: fn(*a)) if args.inline else run_blocking
+
+    for n in range(args.jobs):
+        job_id = f"loadtest-{n}"
+        job = web.TrainingJob(job_id, f"load test {n}", "microwakeword", web.build_training_config({}))
+        job.status = "running"
+        web.training_jobs[job_id] = job
+        eventlet.spawn(simulated_job, job_id, samples, spectrograms, run)
+
+    try:
+        web.socketio.run(web.app, host='0.0.0.0', port=args.port, debug=False, use_reloader=False,
+                         log_output=False)
+    finally:
+        for n in range(args.jobs):
+            shutil.rmtree(web.TRAINING_JOBS_DIR / f"loadtest-{n}", ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
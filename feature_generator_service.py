@@ -10,6 +10,9 @@ import os
 import sys
 from pathlib import Path
 
+# Shared with the trainer app (copied next to this file in the container)
+sys.path.insert(0, str(Path(__file__).parent / "app"))
+
 app = Flask(__name__)
 
 @app.route('/health', methods=['GET'])
@@ -25,23 +28,28 @@ def generate_features():
     Expected JSON:
     {
         "samples_dir": "/path/to/samples",
-        "output_dir": "/path/to/output"
+        "output_dir": "/path/to/output",
+        "feature_format": "float32"  # optional: float32, float16 or uint8
     }
     """
     try:
         data = request.get_json()
         samples_dir = data.get('samples_dir')
         output_dir = data.get('output_dir')
+        feature_format = data.get('feature_format', 'float32')
 
         if not samples_dir or not output_dir:
             return jsonify({"error": "samples_dir and output_dir required"}), 400
 
         # Import here to avoid loading at startup
-        from mmap_ninja.ragged import RaggedMmap
+        from compact_features import FORMATS, write_features
         from microwakeword.audio.clips import Clips
+
+        if feature_format not in FORMATS:
+            return jsonify({"error": f"feature_format must be one of {FORMATS}"}), 400
         from microwakeword.audio.spectrograms import SpectrogramGeneration
 
-        print(f"Generating features from {samples_dir} to {output_dir}", flush=True)
+        print(f"Generating {feature_format} features from {samples_dir} to {output_dir}", flush=True)
 
         # Setup clips
         clips = Clips(
@@ -77,9 +85,10 @@ def generate_features():
             elif split == "testing":
                 split_name = "test"
 
-            RaggedMmap.from_generator(
+            write_features(
                 out_dir=os.path.join(out_dir, 'wakeword_mmap'),
                 sample_generator=spectrograms.spectrogram_generator(split=split_name, repeat=repetition),
+                fmt=feature_format,
                 batch_size=50,
                 verbose=True,
             )
@@ -90,6 +99,7 @@ def generate_features():
         return jsonify({
             "status": "success",
             "output_dir": output_dir,
+            "feature_format": feature_format,
             "splits": splits
         }), 200
 
@@ -2,6 +2,7 @@
 
 let socket;
 let currentJobId = null;
+let liveTest = null;
 
 // Initialize application
 document.addEventListener('DOMContentLoaded', function() {
@@ -21,14 +22,34 @@ function connectWebSocket() {
     
     socket.on('connect', function() {
         console.log('Connected to training server');
+        // Rooms do not survive a reconnect
+        if (currentJobId) {
+            subscribeToJob(currentJobId);
+        }
     });
     
     socket.on('training_progress', function(data) {
         updateProgress(data);
     });
     
+    socket.on('live_test_started', function() {
+        if (liveTest) {
+            liveTest.ready = true;
+            document.getElementById('liveTestStatus').textContent = 'Listening';
+            document.getElementById('liveTestStatus').className = 'status-badge running';
+        }
+    });
+
+    socket.on('live_test_result', updateLiveTest);
+
+    socket.on('live_test_error', function(data) {
+        showNotification('Live test: ' + data.error, 'error');
+        stopLiveTest();
+    });
+    
     socket.on('disconnect', function() {
         console.log('Disconnected from server');
+        stopLiveTest();
     });
 }
 
@@ -48,6 +69,9 @@ function setupEventListeners() {
     const presetSelect = document.getElementById('preset');
     presetSelect.addEventListener('change', handlePresetChange);
     
+    // Live test stop button
+    document.getElementById('liveTestStopBtn').addEventListener('click', stopLiveTest);
+    
     // Download button
     const downloadBtn = document.getElementById('downloadBtn');
     if (downloadBtn) {
@@ -93,7 +117,9 @@ async function handleFormSubmit(e) {
             currentJobId = result.job_id;
             showProgressSection();
             subscribeToJob(result.job_id);
-            showNotification('Training started successfully!', 'success');
+            showNotification(result.coalesced ?
+                'An identical job is already training - following its progress' :
+                'Training started successfully!', 'success');
             
             // Reload job history
             setTimeout(() => loadJobHistory(), 1000);
@@ -292,6 +318,10 @@ function displayJobHistory(jobs) {
                     `<button class="btn btn-primary" onclick="downloadModel('${job.job_id}')">
                         <span class="btn-icon">📱</span> Download for ESPHome
                     </button>` : ''}
+                ${job.status === 'completed' && job.method === 'microwakeword' ?
+                    `<button class="btn btn-secondary" onclick="startLiveTest('${job.job_id}')">
+                        <span class="btn-icon">🎤</span> Test Live
+                    </button>` : ''}
                 ${job.status === 'running' ?
                     `<button class="btn btn-secondary" onclick="viewJob('${job.job_id}')">
                         <span class="btn-icon">👁️</span> View Progress
@@ -330,6 +360,88 @@ function handleDownload() {
     }
 }
 
+// Live test: stream microphone audio (16 kHz, 16-bit PCM) to the trained model
+async function startLiveTest(jobId) {
+    stopLiveTest();
+
+    let stream;
+    try {
+        stream = await navigator.mediaDevices.getUserMedia({
+            audio: { channelCount: 1, echoCancellation: false, noiseSuppression: false, autoGainControl: false }
+        });
+    } catch (error) {
+        showNotification('Microphone access denied: ' + error.message, 'error');
+        return;
+    }
+
+    // The browser resamples the microphone to the context rate
+    const context = new AudioContext({ sampleRate: 16000 });
+    const source = context.createMediaStreamSource(stream);
+    const processor = context.createScriptProcessor(1024, 1, 1);
+
+    liveTest = { jobId, stream, context, source, processor, seq: 0, ready: false, latencies: [] };
+
+    processor.onaudioprocess = function(e) {
+        if (!liveTest || !liveTest.ready) return;
+        const input = e.inputBuffer.getChannelData(0);
+        const pcm = new Int16Array(input.length);
+        for (let i = 0; i < input.length; i++) {
+            const sample = Math.max(-1, Math.min(1, input[i]));
+            pcm[i] = sample < 0 ? sample * 0x8000 : sample * 0x7fff;
+        }
+        socket.emit('live_test_audio', { seq: liveTest.seq++, sent_at: performance.now(), pcm: pcm.buffer });
+    };
+
+    source.connect(processor);
+    processor.connect(context.destination);
+
+    const section = document.getElementById('liveTestSection');
+    section.style.display = 'block';
+    document.getElementById('liveTestStatus').textContent = 'Loading model...';
+    document.getElementById('liveTestStatus').className = 'status-badge';
+    document.getElementById('liveTestStats').textContent = 'Say your wake word into the microphone.';
+    section.scrollIntoView({ behavior: 'smooth' });
+
+    socket.emit('live_test_start', { job_id: jobId });
+}
+
+function stopLiveTest() {
+    if (!liveTest) return;
+
+    socket.emit('live_test_stop');
+    liveTest.processor.disconnect();
+    liveTest.source.disconnect();
+    liveTest.stream.getTracks().forEach(track => track.stop());
+    liveTest.context.close();
+    liveTest = null;
+
+    document.getElementById('liveTestStatus').textContent = 'Stopped';
+    document.getElementById('liveTestStatus').className = 'status-badge';
+}
+
+function updateLiveTest(result) {
+    if (!liveTest || result.error) return;
+
+    // End-to-end latency: chunk sent -> probabilities received
+    liveTest.latencies.push(performance.now() - result.client_sent_at);
+    if (liveTest.latencies.length > 50) liveTest.latencies.shift();
+    const latency = liveTest.latencies.reduce((a, b) => a + b, 0) / liveTest.latencies.length;
+
+    if (result.probabilities.length) {
+        const probability = Math.max(...result.probabilities);
+        document.getElementById('liveTestProbability').textContent = probability.toFixed(2);
+        document.getElementById('liveTestBar').style.width = `${Math.round(probability * 100)}%`;
+    }
+
+    if (result.detections.length) {
+        showNotification('Wake word detected!', 'success');
+    }
+
+    document.getElementById('liveTestStats').textContent =
+        `Detections: ${result.total_detections} • Latency: ${latency.toFixed(0)} ms ` +
+        `(server inference ${result.inference_ms} ms)`;
+}
+
 // Show notification
 function showNotification(message, type = 'info') {
     // Create notification element